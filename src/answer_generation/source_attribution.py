@@ -1,19 +1,39 @@
 from typing import List, Dict, Set
 from datetime import datetime
 import re
+import sys
+from types import MappingProxyType
+
+# Reliability labels are interned so citation aggregation and equality checks
+# can short-circuit on identity instead of comparing characters.
+_HIGH = sys.intern("High")
+_MEDIUM_HIGH = sys.intern("Medium-High")
+_MEDIUM = sys.intern("Medium")
 
 
 class SourceAttributor:
+    # Interned filing type codes used for reliability classification
+    PRIMARY_FILING_TYPES = frozenset(sys.intern(t) for t in ("10-K", "10-Q", "8-K", "DEF 14A"))
+    INSIDER_FILING_TYPES = frozenset(sys.intern(t) for t in ("3", "4", "5"))
+
+    _FILING_TYPE_NAMES = MappingProxyType({
+        "10-K": "Annual Report",
+        "10-Q": "Quarterly Report",
+        "8-K": "Current Report",
+        "DEF 14A": "Proxy Statement",
+        "3": "Initial Statement of Ownership",
+        "4": "Statement of Changes in Ownership",
+        "5": "Annual Statement of Ownership"
+    })
+
     def __init__(self):
-        self.filing_type_names = {
-            "10-K": "Annual Report",
-            "10-Q": "Quarterly Report", 
-            "8-K": "Current Report",
-            "DEF 14A": "Proxy Statement",
-            "3": "Initial Statement of Ownership",
-            "4": "Statement of Changes in Ownership",
-            "5": "Annual Statement of Ownership"
-        }
+        self.filing_type_names = self._FILING_TYPE_NAMES
+        
+        # Cheap pre-check: every inline citation pattern needs one of these
+        self._probe_re = re.compile(
+            r"\$|%|\d{4}|according to|reported|disclosed|stated|filed",
+            re.IGNORECASE
+        )
     
     def generate_citations(self, relevant_docs: List[Dict]) -> List[Dict]:
         """Generate formatted citations for relevant documents."""
@@ -45,13 +65,14 @@ class SourceAttributor:
     def _format_citation(self, metadata: Dict, citation_number: int) -> Dict:
         """Format a single citation."""
         
-        ticker = metadata.get("ticker", "Unknown")
-        filing_type = metadata.get("filing_type", "Unknown")
-        filing_date = metadata.get("filing_date", "Unknown")
-        company_name = metadata.get("company_name", ticker)
+        get = metadata.get
+        ticker = get("ticker", "Unknown")
+        filing_type = get("filing_type", "Unknown")
+        filing_date = get("filing_date", "Unknown")
+        company_name = get("company_name", ticker)
         
         # Get full filing type name
-        filing_name = self.filing_type_names.get(filing_type, filing_type)
+        filing_name = self._FILING_TYPE_NAMES.get(filing_type, filing_type)
         
         # Format date
         formatted_date = self._format_date(filing_date)
@@ -103,12 +124,12 @@ class SourceAttributor:
         filing_date = metadata.get("filing_date", "")
         
         # Primary sources (official SEC filings) are highly reliable
-        if filing_type in ["10-K", "10-Q", "8-K", "DEF 14A"]:
-            reliability = "High"
-        elif filing_type in ["3", "4", "5"]:
-            reliability = "Medium-High"
+        if filing_type in self.PRIMARY_FILING_TYPES:
+            reliability = _HIGH
+        elif filing_type in self.INSIDER_FILING_TYPES:
+            reliability = _MEDIUM_HIGH
         else:
-            reliability = "Medium"
+            reliability = _MEDIUM
         
         # Adjust based on recency
         if filing_date:
@@ -116,11 +137,11 @@ class SourceAttributor:
                 if filing_date.startswith("2024") or filing_date.startswith("2023"):
                     pass  # Keep current reliability
                 elif filing_date.startswith("2022"):
-                    if reliability == "High":
-                        reliability = "Medium-High"
+                    if reliability is _HIGH:
+                        reliability = _MEDIUM_HIGH
                 elif filing_date.startswith("2021") or filing_date.startswith("2020"):
-                    if reliability == "High":
-                        reliability = "Medium"
+                    if reliability is _HIGH:
+                        reliability = _MEDIUM
             except:
                 pass
         
@@ -136,6 +157,8 @@ class SourceAttributor:
         filing_type_counts = {}
         company_counts = {}
         reliability_counts = {}
+        earliest = latest = None
+        date_count = 0
         
         for citation in citations:
             # Filing type counts
@@ -149,16 +172,22 @@ class SourceAttributor:
             # Reliability counts
             reliability = citation["source_reliability"]
             reliability_counts[reliability] = reliability_counts.get(reliability, 0) + 1
+            
+            # Track date range without building a sorted list
+            filing_date = citation["filing_date"]
+            if filing_date != "Unknown":
+                date_count += 1
+                if earliest is None or filing_date < earliest:
+                    earliest = filing_date
+                if latest is None or filing_date > latest:
+                    latest = filing_date
         
         # Find date range
-        dates = [c["filing_date"] for c in citations if c["filing_date"] != "Unknown"]
         date_range = None
-        if dates:
-            sorted_dates = sorted(dates)
-            if len(sorted_dates) > 1:
-                date_range = f"{self._format_date(sorted_dates[0])} to {self._format_date(sorted_dates[-1])}"
-            else:
-                date_range = self._format_date(sorted_dates[0])
+        if date_count > 1:
+            date_range = f"{self._format_date(earliest)} to {self._format_date(latest)}"
+        elif date_count == 1:
+            date_range = self._format_date(earliest)
         
         return {
             "total_sources": len(citations),
@@ -167,7 +196,7 @@ class SourceAttributor:
             "company_breakdown": company_counts,
             "reliability_breakdown": reliability_counts,
             "date_range": date_range,
-            "primary_sources": len([c for c in citations if c["source_reliability"] == "High"])
+            "primary_sources": sum(1 for c in citations if c["source_reliability"] == _HIGH)
         }
     
     def format_inline_citations(self, answer: str, citations: List[Dict]) -> str:
@@ -176,6 +205,10 @@ class SourceAttributor:
         if not citations:
             return answer
         
+        # Skip the pattern scans when nothing in the answer could match
+        if not self._probe_re.search(answer):
+            return answer
+        
         # Simple approach: add citation numbers at the end of sentences
         # that likely reference specific information
         
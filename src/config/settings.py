@@ -8,9 +8,14 @@ providing a centralized configuration management system.
 """
 
 import os
+from types import MappingProxyType
 from dotenv import load_dotenv
 
-load_dotenv()
+# The settings module can be imported as both ``config.settings`` and
+# ``src.config.settings``; only read the .env file once per process.
+if not os.environ.get("_SETTINGS_LOADED"):
+    load_dotenv(override=False)
+    os.environ["_SETTINGS_LOADED"] = "1"
 
 # API Configuration
 SEC_API_KEY = os.getenv("SEC_API_KEY")
@@ -62,13 +67,17 @@ COMPANIES = {
     "BA": {"name": "The Boeing Company", "sector": "Manufacturing"}
 }
 
+# Read-only view so the mapping can be shared safely across download threads
+COMPANIES = MappingProxyType(COMPANIES)
+
 # Filing types to collect
-FILING_TYPES = ["10-K", "10-Q", "8-K", "DEF 14A", "3", "4", "5"]
+FILING_TYPES = ("10-K", "10-Q", "8-K", "DEF 14A", "3", "4", "5")
 
 # Document processing configuration
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", 1000))
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", 200))
 MAX_CONCURRENT_DOWNLOADS = int(os.getenv("MAX_CONCURRENT_DOWNLOADS", 5))
+MAX_CHUNKING_WORKERS = int(os.getenv("MAX_CHUNKING_WORKERS", os.cpu_count() or 1))
 
 # Vector database configuration
 VECTOR_DB_PATH = os.getenv("VECTOR_DB_PATH", "./data/vector_db")
@@ -1,7 +1,7 @@
 import asyncio
 import os
 from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
 
 from .sec_api_client import SECAPIClient
@@ -57,8 +57,12 @@ class DataDownloader:
         os.makedirs(RAW_DATA_DIR, exist_ok=True)
         
         results = []
+        log_file = os.path.join(RAW_DATA_DIR, "download_log.jsonl")
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+        # Each company result is appended as soon as it completes so progress
+        # survives a crash part-way through the run; earlier runs' lines are kept
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, \
+                open(log_file, 'a') as log:
             # Submit all download tasks
             future_to_ticker = {
                 executor.submit(self.download_single_company, ticker): ticker 
@@ -66,24 +70,28 @@ class DataDownloader:
             }
             
             # Collect results as they complete
-            for future in future_to_ticker:
+            for future in as_completed(future_to_ticker):
                 ticker = future_to_ticker[future]
                 try:
                     result = future.result()
-                    results.append(result)
                 except Exception as e:
                     print(f"Exception for {ticker}: {e}")
-                    results.append({
+                    result = {
                         "ticker": ticker,
                         "status": "error",
                         "error": str(e)
-                    })
+                    }
+                results.append(result)
+                log.write(json.dumps(result) + "\n")
+                log.flush()
+        
+        print(f"Download log saved to: {log_file}")
         
         # Generate summary
         summary = self._generate_summary(results)
         
-        # Save download log
-        self._save_download_log(results, summary)
+        # Save download summary
+        self._save_download_summary(summary)
         
         return {
             "results": results,
@@ -114,46 +122,43 @@ class DataDownloader:
             "success_rate": f"{(successful_companies/total_companies)*100:.1f}%"
         }
     
-    def _save_download_log(self, results: List[Dict], summary: Dict):
-        """Save download results and summary to JSON file."""
+    def _save_download_summary(self, summary: Dict):
+        """Save download summary to JSON file."""
         
-        log_data = {
+        summary_data = {
             "download_timestamp": asyncio.get_event_loop().time(),
-            "summary": summary,
-            "detailed_results": results
+            "summary": summary
         }
         
-        log_file = os.path.join(RAW_DATA_DIR, "download_log.json")
+        summary_file = os.path.join(RAW_DATA_DIR, "download_summary.json")
         
-        with open(log_file, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        with open(summary_file, 'w') as f:
+            json.dump(summary_data, f, indent=2)
         
-        print(f"Download log saved to: {log_file}")
+        print(f"Download summary saved to: {summary_file}")
     
     def download_company_filings_enhanced(self, ticker: str, filing_types: List[str]) -> List[str]:
         """Enhanced download method with fallback strategies."""
         
         downloaded_files = []
         
+        # One API request per ticker; limit to 3 filings per type to manage API usage
+        filings_by_type = self.sec_client.search_filings_multi_with_fallback(
+            ticker, filing_types, "2022-01-01", "2024-01-01", max_filings_per_type=3
+        )
+        
         for filing_type in filing_types:
             print(f"Processing {filing_type} filings for {ticker}...")
             
-            # Use enhanced search with fallback
-            filings = self.sec_client.search_filings_with_fallback(
-                ticker, filing_type, "2022-01-01", "2024-01-01"
-            )
-            
-            # Limit to 3 filings per type to manage API usage
-            limited_filings = filings[:3]
-            
-            for filing in limited_filings:
+            for filing in filings_by_type[filing_type]:
                 if filing.get("filing_url"):
                     # Use enhanced download method
                     filepath = self.sec_client.download_filing_enhanced(
                         filing["filing_url"],
                         filing["ticker"],
                         filing["filing_type"],
-                        filing["filing_date"]
+                        filing["filing_date"],
+                        guessed_url=filing.get("guessed_url", False)
                     )
                     if filepath:
                         downloaded_files.append(filepath)
@@ -163,13 +168,23 @@ class DataDownloader:
     def get_download_status(self) -> Dict:
         """Get status of previous downloads."""
         
-        log_file = os.path.join(RAW_DATA_DIR, "download_log.json")
+        summary_file = os.path.join(RAW_DATA_DIR, "download_summary.json")
+        log_file = os.path.join(RAW_DATA_DIR, "download_log.jsonl")
         
-        if not os.path.exists(log_file):
+        if not os.path.exists(summary_file) and not os.path.exists(log_file):
             return {"status": "no_previous_downloads"}
         
         try:
-            with open(log_file, 'r') as f:
-                return json.load(f)
+            status = {}
+            if os.path.exists(summary_file):
+                with open(summary_file, 'r') as f:
+                    status.update(json.load(f))
+            
+            # The per-company log may be partial if the last run was interrupted
+            if os.path.exists(log_file):
+                with open(log_file, 'r') as f:
+                    status["detailed_results"] = [json.loads(line) for line in f if line.strip()]
+            
+            return status
         except Exception as e:
-            return {"status": "error", "error": str(e)}
\ No newline at end of file
+            return {"status": "error", "error": str(e)}
@@ -1,7 +1,23 @@
+import asyncio
+import atexit
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+import html
+import logging
+from itertools import groupby
+import httpx
+import orjson
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import threading
 import time
-import json
-from typing import List, Dict, Optional
+from types import MappingProxyType
+import weakref
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urljoin
 from datetime import datetime, timedelta
 import os
 
@@ -10,176 +26,608 @@ try:
 except ImportError:
     from src.config.settings import SEC_API_KEY, SEC_API_SEARCH_URL, SEC_EDGAR_BASE_URL, SEC_FORMS_URL, RAW_DATA_DIR
 
+logger = logging.getLogger(__name__)
+
+# Anchor tags on EDGAR filing index pages: (href, inner html)
+_ANCHOR_RE = re.compile(rb'<a\s[^>]*?href\s*=\s*["\']([^"\']+)["\'][^>]*>(.*?)</a\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(rb'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Only advertise brotli when urllib3/httpx can actually decode it
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = 'br, gzip, deflate'
+except ImportError:
+    _ACCEPT_ENCODING = 'gzip, deflate'
+
+# Link-text patterns identifying a filing's primary document, per filing type
+_PRIMARY_PATTERNS = MappingProxyType({
+    '10-K': ('10-k', 'annual report', 'form 10-k'),
+    '10-Q': ('10-q', 'quarterly report', 'form 10-q'),
+    '8-K': ('8-k', 'current report', 'form 8-k'),
+    'DEF 14A': ('def 14a', 'proxy statement', 'definitive proxy'),
+    '3': ('form 3', 'initial statement'),
+    '4': ('form 4', 'statement of changes'),
+    '5': ('form 5', 'annual statement')
+})
+
+# Lowercased byte markers of XBRL viewer shells (bad signs) and real filing content (good signs)
+_XBRL_INDICATORS = (
+    b'xbrl viewer',
+    b'ixviewer',
+    b'loadviewer',
+    b'javascript',
+    b'iframe',
+    b'this page uses javascript'
+)
+_FILING_INDICATORS = MappingProxyType({
+    '10-K': (b'annual report', b'business overview', b'risk factors', b'management discussion'),
+    '10-Q': (b'quarterly report', b'financial statements', b'condensed consolidated'),
+    '8-K': (b'current report', b'item 1', b'item 2', b'signature'),
+    'DEF 14A': (b'proxy statement', b'annual meeting', b'executive compensation'),
+    '3': (b'initial statement', b'beneficial ownership'),
+    '4': (b'statement of changes', b'securities acquired'),
+    '5': (b'annual statement', b'securities beneficially owned')
+})
+_DEFAULT_FILING_INDICATORS = (b'sec filing', b'securities')
+
+# Advisory file locks keep concurrent processes from losing request counts
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Optional transparent HTTP cache for EDGAR index pages
+try:
+    from requests_cache import CachedSession, DO_NOT_CACHE
+except ImportError:
+    CachedSession = None
+
+# Request headers are fixed for the life of the process, so build them once
+_SEC_API_HEADERS = {'Content-Type': 'application/json'}
+if SEC_API_KEY:
+    _SEC_API_HEADERS['Authorization'] = SEC_API_KEY  # sec-api.io uses direct API key, not Bearer
+
+# Host is derived from each URL by requests/httpx; hardcoding it breaks non-www archives
+_EDGAR_HEADERS = {
+    'User-Agent': 'SEC Filing QA Agent research@example.com',
+    'Accept-Encoding': _ACCEPT_ENCODING,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
+}
+_EDGAR_TEXT_HEADERS = {'Accept': 'text/plain'}
+
+# Clients whose pending request counts are flushed at exit. A WeakSet keeps the
+# exit hook from pinning discarded clients (and their sessions) in memory.
+_live_clients = weakref.WeakSet()
+
+
+def _flush_request_counts():
+    for client in list(_live_clients):
+        client._save_request_count()
+
+
+atexit.register(_flush_request_counts)
+
+
+@dataclass(frozen=True)
+class FilingInfo:
+    # Explicit __slots__ (rather than slots=True) keeps Python 3.8 support
+    __slots__ = ('ticker', 'filing_type', 'filing_date', 'filing_url',
+                 'company_name', 'form_type', 'accession_number', 'cik')
+    ticker: str
+    filing_type: str
+    filing_date: str
+    filing_url: str
+    company_name: str
+    form_type: str
+    accession_number: str
+    cik: str
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter shared by sync and async callers."""
+    
+    def __init__(self, capacity: int = 10, refill_rate: float = 10.0):
+        self.capacity = capacity
+        self.refill_rate = refill_rate  # tokens per second
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self, n: int = 1) -> float:
+        """Take n tokens and return how long the caller must wait before using them."""
+        
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+            
+            # Tokens may go negative: later callers queue behind the debt
+            self.tokens -= n
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.refill_rate
+    
+    def acquire(self, n: int = 1):
+        """Block until n tokens are available."""
+        
+        delay = self._reserve(n)
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def acquire_async(self, n: int = 1):
+        """Wait without blocking the event loop until n tokens are available."""
+        
+        delay = self._reserve(n)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class PartialDownload:
+    """A download written to <path>.part and renamed into place once complete."""
+    
+    def __init__(self, filepath: str, prefix_bytes: int):
+        self.filepath = filepath
+        self.part_path = filepath + '.part'
+        self.prefix_bytes = prefix_bytes
+        self.prefix = bytearray()
+        self._file = open(self.part_path, 'wb')
+    
+    def write(self, chunk: bytes):
+        """Append a chunk, keeping the leading bytes for validation."""
+        
+        self._file.write(chunk)
+        if len(self.prefix) < self.prefix_bytes:
+            self.prefix += chunk[:self.prefix_bytes - len(self.prefix)]
+    
+    def finish(self, complete: bool) -> bytes:
+        """Close the .part file and rename it if complete, else remove it."""
+        
+        # Renaming only a complete body means an interrupted download never
+        # passes for a finished one in _is_downloaded
+        self._file.close()
+        if complete:
+            os.replace(self.part_path, self.filepath)
+        else:
+            try:
+                os.remove(self.part_path)
+            except OSError:
+                pass
+        return bytes(self.prefix)
+
 
 class SECAPIClient:
+    # Only the head of a streamed document is kept in memory for validation
+    STREAM_CHUNK_SIZE = 64 * 1024
+    VALIDATION_PREFIX_BYTES = 256 * 1024
+    
+    # Filings are immutable once filed, so search results can be reused for a day
+    SEARCH_CACHE_TTL = 86400
+    SEARCH_CACHE_MAX_ENTRIES = 256
+    
+    # Filing index pages rarely change after a filing is accepted
+    HTTP_CACHE_TTL = 7 * 86400
+    
+    # Request-count increments are flushed to disk at most this often (seconds)
+    REQUEST_COUNT_SAVE_INTERVAL = 30
+    
+    # Files smaller than this are treated as failed downloads and fetched again
+    MIN_CACHED_FILE_BYTES = 1024
+    
     def __init__(self):
         self.api_key = SEC_API_KEY
         self.search_url = SEC_API_SEARCH_URL
         self.edgar_url = SEC_EDGAR_BASE_URL
         self.forms_url = SEC_FORMS_URL
-        self.session = requests.Session()
-        self.rate_limit_delay = 0.1  # 10 requests per second
+        
+        # Ensure directory exists once, rather than on every write
+        os.makedirs(RAW_DATA_DIR, exist_ok=True)
+        self.session = self._create_session()
+        
+        # Pooled keep-alive connections with retry/backoff for transient errors.
+        # EDGAR gets its own pool so document downloads never starve other hosts.
+        self.session.mount('https://www.sec.gov', self._make_adapter())
+        self.session.mount('https://', self._make_adapter(pool_maxsize=16))
+        self.session.mount('http://', self._make_adapter(pool_maxsize=16))
+        self.requests_per_second = 10
+        # Separate quotas for sec-api.io and SEC EDGAR (www.sec.gov)
+        self._search_bucket = TokenBucket(self.requests_per_second, self.requests_per_second)
+        self._edgar_bucket = TokenBucket(self.requests_per_second, self.requests_per_second)
+        self.max_concurrent_downloads = 8
         self.request_count = 0
         self.max_requests_per_day = 95  # Stay under 100 limit
         
         # Enhanced headers for SEC EDGAR access
-        self.session.headers.update({
-            'User-Agent': 'SEC Filing QA Agent research@example.com',
-            'Accept-Encoding': 'gzip, deflate',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
-        })
+        self.session.headers.update(_EDGAR_HEADERS)
+        
+        # sec-api.io speaks HTTP/2, so search queries share one multiplexed connection
+        self.http2_client = httpx.Client(
+            headers=_SEC_API_HEADERS,
+            transport=httpx.HTTPTransport(http2=True, retries=3),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            timeout=30
+        )
         
         if not self.api_key:
-            print("Warning: SEC_API_KEY not found. Using fallback methods.")
+            logger.warning("SEC_API_KEY not found. Using fallback methods.")
             
-        # Load request count from cache if available
+        # Load request count from cache if available; increments are batched
+        # in memory and always flushed on exit
+        self._count_lock = threading.Lock()
+        self._unsaved_requests = 0
+        self._count_dirty = False
+        self._last_count_save = time.monotonic()
         self._load_request_count()
+        _live_clients.add(self)
+        
+        # On-disk caches for search results and resolved document links
+        self._cache_lock = threading.Lock()
+        self._search_cache_file = os.path.join(RAW_DATA_DIR, '.search_cache.json')
+        self._document_link_file = os.path.join(RAW_DATA_DIR, '.document_links.json')
+        self._search_cache = self._load_search_cache()
+        self._document_links = self._load_json_cache(self._document_link_file)
+        
+        # HTTP validators (ETag/Last-Modified) for conditional re-downloads
+        self._etag_file = os.path.join(RAW_DATA_DIR, '.etag_cache.json')
+        self._etags = self._load_json_cache(self._etag_file)
+        
+        # (ticker, filing_type) -> downloaded filenames, built lazily from one directory scan
+        self._dir_index = None
+    
+    def close(self):
+        """Flush the request count and close the HTTP session and client."""
+        
+        self._save_request_count()
+        self.http2_client.close()
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _create_session(self) -> requests.Session:
+        """Create the EDGAR session, backed by an on-disk HTTP cache when available."""
+        
+        if CachedSession is None:
+            return requests.Session()
+        
+        # Only filing index pages are cached here; documents are streamed to
+        # disk and revalidated separately, so buffering them in SQLite would
+        # just duplicate them
+        return CachedSession(
+            os.path.join(RAW_DATA_DIR, '.http_cache'),
+            backend='sqlite',
+            # Response Cache-Control headers would override the URL rules below
+            cache_control=False,
+            stale_if_error=True,
+            allowable_methods=('GET', 'HEAD'),
+            urls_expire_after={
+                '*-index.htm': self.HTTP_CACHE_TTL,
+                '*-index.html': self.HTTP_CACHE_TTL,
+                '*': DO_NOT_CACHE
+            }
+        )
+    
+    def _make_adapter(self, pool_maxsize: int = 32) -> HTTPAdapter:
+        """Create a pooled adapter that retries transient failures with backoff."""
+        
+        return HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=['GET', 'POST']
+            )
+        )
+    
+    def _build_search_query(self, ticker: str, filing_type: str,
+                            start_date: str, end_date: str) -> Dict:
+        """Build a sec-api.io full-text search query."""
         
-    def search_filings(self, ticker: str, filing_type: str,
-                      start_date: str = "2022-01-01",
-                      end_date: str = "2024-01-01") -> List[Dict]:
-        """Search for SEC filings for a specific ticker and filing type."""
-
         # Correct sec-api.io query format
-        query = {
+        return {
             "query": f"ticker:{ticker} AND formType:\"{filing_type}\" AND filedAt:[{start_date} TO {end_date}]",
             "from": "0",
             "size": "10",
             "sort": [{"filedAt": {"order": "desc"}}]
         }
-
-        # Correct authentication method for sec-api.io
-        headers = {
-            "Authorization": self.api_key,  # sec-api.io uses direct API key, not Bearer
-            "Content-Type": "application/json"
+    
+    def _build_multi_search_query(self, ticker: str, filing_types: List[str],
+                                  start_date: str, end_date: str) -> Dict:
+        """Build one query covering several form types for a ticker."""
+        
+        form_types = " OR ".join(f"\"{filing_type}\"" for filing_type in filing_types)
+        return {
+            "query": f"ticker:{ticker} AND formType:({form_types}) AND filedAt:[{start_date} TO {end_date}]",
+            "from": "0",
+            "size": str(self._multi_search_size(filing_types)),
+            "sort": [{"filedAt": {"order": "desc"}}]
         }
-
+    
+    def _multi_search_size(self, filing_types: List[str]) -> int:
+        """Page size of a multi-type search; sec-api.io caps a single page at 50 results."""
+        return min(10 * len(filing_types), 50)
+    
+    def _crowded_out_types(self, filings: List[Dict], grouped: Dict[str, List[Dict]],
+                           filing_types: List[str], max_filings_per_type: int) -> List[str]:
+        """Filing types a full multi-type page may have cut short."""
+        
+        # The page is sorted by date across all types, so frequent Form 4 and 8-K
+        # filings can fill it before older 10-K/10-Q/DEF 14A filings appear. A
+        # short page holds every match, so nothing is missing then.
+        if len(filings) < self._multi_search_size(filing_types):
+            return []
+        
+        return [
+            filing_type for filing_type in filing_types
+            if len(grouped.get(filing_type, [])) < max_filings_per_type
+        ]
+    
+    def _group_filings_by_type(self, filings: List[Dict], filing_types: List[str],
+                               max_filings_per_type: int) -> Dict[str, List[Dict]]:
+        """Split a mixed result set into the newest filings of each requested type."""
+        
+        # Stable sorts give (formType, filedAt desc) ordering
+        ordered = sorted(filings, key=lambda f: f.get("filedAt", ""), reverse=True)
+        ordered.sort(key=lambda f: f.get("formType", ""))
+        
+        grouped = {}
+        for form_type, group in groupby(ordered, key=lambda f: f.get("formType", "")):
+            if form_type in filing_types:
+                grouped[form_type] = list(group)[:max_filings_per_type]
+        
+        return grouped
+    
+    def _prepare_search(self, ticker: str, filing_types: List[str],
+                        start_date: str, end_date: str) -> Tuple[str, str, Dict]:
+        """Return the cache key, log label and query of a search."""
+        
+        label = "/".join(filing_types)
+        cache_key = self._search_cache_key(ticker, label, start_date, end_date)
+        if len(filing_types) == 1:
+            query = self._build_search_query(ticker, filing_types[0], start_date, end_date)
+        else:
+            query = self._build_multi_search_query(ticker, filing_types, start_date, end_date)
+        
+        logger.debug("Searching with query: %s", query['query'])
+        return cache_key, label, query
+    
+    def _cached_search_results(self, cache_key: str, ticker: str, label: str) -> Optional[List[Dict]]:
+        """Return cached search results, logging the hit."""
+        
+        cached = self._get_cached_search(cache_key)
+        if cached is not None:
+            logger.info("Using cached search results for %s %s", ticker, label)
+        return cached
+    
+    def _parse_search_response(self, response: httpx.Response, cache_key: str,
+                               ticker: str, label: str) -> List[Dict]:
+        """Check a sec-api.io search response and cache the filings it holds."""
+        
+        logger.debug("Response status: %d", response.status_code)
+        if response.status_code != 200:
+            logger.warning("HTTP %d: %.200s", response.status_code, response.text)
+        
+        response.raise_for_status()
+        
+        filings = orjson.loads(response.content).get("filings", [])
+        logger.info("Found %d filings for %s %s", len(filings), ticker, label)
+        self._cache_search(cache_key, filings)
+        return filings
+    
+    def search_filings(self, ticker: str, filing_type: str,
+                      start_date: str = "2022-01-01",
+                      end_date: str = "2024-01-01",
+                      use_cache: bool = True) -> List[Dict]:
+        """Search for SEC filings for a specific ticker and filing type."""
+        return self.search_filings_multi(ticker, [filing_type], start_date, end_date, use_cache)
+    
+    def search_filings_multi(self, ticker: str, filing_types: List[str],
+                             start_date: str = "2022-01-01",
+                             end_date: str = "2024-01-01",
+                             use_cache: bool = True) -> List[Dict]:
+        """Search several filing types for a ticker with a single sec-api.io request."""
+        
+        cache_key, label, query = self._prepare_search(ticker, filing_types, start_date, end_date)
+        if use_cache:
+            cached = self._cached_search_results(cache_key, ticker, label)
+            if cached is not None:
+                return cached
+        
         try:
-            print(f"Searching with query: {query['query']}")
-            response = self.session.post(
-                self.search_url,
-                headers=headers,
-                json=query
-            )
-
-            print(f"Response status: {response.status_code}")
-            if response.status_code != 200:
-                print(f"Response text: {response.text}")
-
-            response.raise_for_status()
-
-            data = response.json()
-            filings = data.get("filings", [])
-            print(f"Found {len(filings)} filings for {ticker} {filing_type}")
-            return filings
-
-        except requests.exceptions.RequestException as e:
-            print(f"Error searching filings for {ticker} {filing_type}: {e}")
+            self._search_bucket.acquire()
+            response = self.http2_client.post(self.search_url, content=orjson.dumps(query))
+            return self._parse_search_response(response, cache_key, ticker, label)
+        
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+            logger.error("Error searching filings for %s %s: %s", ticker, label, e)
             return []
-
-        finally:
-            time.sleep(self.rate_limit_delay)
     
     def download_filing(self, filing_url: str, ticker: str,
-                       filing_type: str, filing_date: str) -> Optional[str]:
+                       filing_type: str, filing_date: str,
+                       use_cache: bool = True) -> Optional[str]:
         """Download a specific SEC filing with enhanced document detection."""
 
-        try:
-            # Add headers for SEC EDGAR access
-            headers = {
-                'User-Agent': 'SEC Filing QA Agent research@example.com',
-                'Accept-Encoding': 'gzip, deflate',
-                'Host': 'www.sec.gov'
-            }
-
-            # First, get the filing detail page
-            response = self.session.get(filing_url, headers=headers)
-            response.raise_for_status()
+        # Filenames are deterministic, so a previous run's file can be reused as-is
+        filepath = self._filing_path(ticker, filing_type, filing_date)
+        if use_cache and self._is_downloaded(filepath):
+            logger.info("Cached: %s", os.path.basename(filepath))
+            return filepath
 
-            # Parse the detail page to find the actual filing document link
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
+        try:
+            # Reuse a previously resolved document link if we have one
+            document_url = self._document_links.get(filing_url) if use_cache else None
+            
+            if document_url is None:
+                # First, get the filing detail page
+                self._edgar_bucket.acquire()
+                response = self.session.get(filing_url)
+                response.raise_for_status()
 
-            # Enhanced document link detection
-            document_link = self._find_actual_filing_document(soup, filing_type)
+                document_url = self._select_document_url(response.content, filing_url, filing_type)
+                self._cache_document_link(filing_url, document_url)
             
-            if document_link:
-                # Download the actual document
-                document_url = self._construct_document_url(document_link)
-                print(f"Downloading actual filing from: {document_url}")
-                
-                doc_response = self.session.get(document_url, headers=headers)
-                doc_response.raise_for_status()
-                document_content = doc_response.text
-                
-                # Validate that we got actual filing content
-                if self._validate_filing_content(document_content, filing_type):
-                    print(f"✅ Successfully downloaded actual {filing_type} filing")
-                else:
-                    print(f"⚠️  Downloaded content may not be actual filing - using anyway")
-                    
-            else:
-                print(f"❌ Could not find actual filing document for {filing_url}")
-                # Try alternative approach - look for text version
-                text_link = self._find_text_version(soup)
-                if text_link:
-                    document_url = self._construct_document_url(text_link)
-                    doc_response = self.session.get(document_url, headers=headers)
+            if document_url:
+                # Stream the (potentially multi-MB) document straight to disk
+                self._edgar_bucket.acquire()
+                with self.session.get(document_url, headers=self._conditional_headers(document_url),
+                                      stream=True) as doc_response:
+                    if doc_response.status_code == 304:
+                        return self._not_modified(document_url)
                     doc_response.raise_for_status()
-                    document_content = doc_response.text
-                else:
-                    # Last resort - use the detail page content
-                    document_content = response.text
-
-            # Create filename
-            safe_date = filing_date.replace("-", "").replace("T", "_").split("_")[0]
-            filename = f"{ticker}_{filing_type}_{safe_date}.html"
-            filepath = os.path.join(RAW_DATA_DIR, filename)
-
-            # Ensure directory exists
-            os.makedirs(RAW_DATA_DIR, exist_ok=True)
-
-            # Save file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(document_content)
+                    prefix = self._stream_to_file(
+                        doc_response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE), filepath
+                    )
+                self._remember_validators(document_url, doc_response.headers, filepath)
+                self._report_filing_content(prefix, filing_type)
+                self._dir_index = None
+                logger.info("Downloaded: %s", os.path.basename(filepath))
+                return filepath
 
-            print(f"Downloaded: {filename}")
+            # Last resort - use the detail page content
+            filepath = self._save_filing(response.text, ticker, filing_type, filing_date)
             return filepath
 
         except requests.exceptions.RequestException as e:
-            print(f"Error downloading filing {filing_url}: {e}")
+            logger.error("Error downloading filing %s: %s", filing_url, e)
             return None
+    
+    def _select_document_url(self, detail_html: bytes, filing_url: str,
+                             filing_type: str) -> Optional[str]:
+        """Pick the primary document (or text version) from a filing detail page."""
+        
+        # Scan the detail page once for its links
+        links = self._extract_links(detail_html)
 
+        # Enhanced document link detection
+        document_link = self._find_actual_filing_document(links, filing_type)
+        
+        if document_link:
+            # Download the actual document
+            document_url = urljoin(filing_url, document_link)
+            logger.debug("Downloading actual filing from: %s", document_url)
+            return document_url
+        
+        logger.warning("Could not find actual filing document for %s", filing_url)
+        # Try alternative approach - look for text version
+        text_link = self._find_text_version(links)
+        if text_link:
+            return urljoin(filing_url, text_link)
+        
+        return None
+    
+    def _report_filing_content(self, document_prefix: bytes, filing_type: str):
+        """Log whether the head of a downloaded document looks like an actual filing."""
+        
+        # Validate that we got actual filing content
+        if self._validate_filing_content(document_prefix, filing_type):
+            logger.debug("Successfully downloaded actual %s filing", filing_type)
+        else:
+            logger.warning("Downloaded content may not be actual %s filing - using anyway", filing_type)
+    
+    def _filing_path(self, ticker: str, filing_type: str, filing_date: str) -> str:
+        """Build the local path for a filing."""
+        
+        # Create filename
+        safe_date = filing_date.replace("-", "").replace("T", "_").split("_")[0]
+        filename = f"{ticker}_{filing_type}_{safe_date}.html"
+        
+        return os.path.join(RAW_DATA_DIR, filename)
+    
+    def _is_downloaded(self, filepath: str) -> bool:
+        """Check whether a filing already exists on disk with real content."""
+        return os.path.exists(filepath) and os.path.getsize(filepath) > self.MIN_CACHED_FILE_BYTES
+    
+    def _save_filing(self, document_content: str, ticker: str,
+                     filing_type: str, filing_date: str) -> str:
+        """Write filing content to the raw data directory."""
+        
+        filepath = self._filing_path(ticker, filing_type, filing_date)
+
+        # Save file
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(document_content)
+        self._dir_index = None
+
+        logger.info("Downloaded: %s", os.path.basename(filepath))
+        return filepath
+    
+    def _stream_to_file(self, chunks, filepath: str) -> bytes:
+        """Write an iterable of byte chunks to disk, returning the leading bytes."""
+        
+        download = PartialDownload(filepath, self.VALIDATION_PREFIX_BYTES)
+        complete = False
+        try:
+            for chunk in chunks:
+                download.write(chunk)
+            complete = True
         finally:
-            time.sleep(self.rate_limit_delay)
+            prefix = download.finish(complete)
+        
+        return prefix
+    
+    async def _stream_to_file_async(self, chunks, filepath: str) -> bytes:
+        """Async variant of _stream_to_file; file I/O runs in the default executor."""
+        
+        loop = asyncio.get_running_loop()
+        download = await loop.run_in_executor(
+            None, PartialDownload, filepath, self.VALIDATION_PREFIX_BYTES
+        )
+        complete = False
+        try:
+            async for chunk in chunks:
+                await loop.run_in_executor(None, download.write, chunk)
+            complete = True
+        finally:
+            prefix = await loop.run_in_executor(None, download.finish, complete)
+        
+        return prefix
+    
+    def _build_filing_info(self, ticker: str, filing_type: str, filing: Dict) -> FilingInfo:
+        """Normalize a sec-api.io filing record."""
+        
+        # Use correct field names from sec-api.io response
+        return FilingInfo(
+            ticker=ticker,
+            filing_type=filing_type,
+            filing_date=filing.get("filedAt", ""),
+            filing_url=filing.get("linkToHtml", filing.get("linkToFilingDetails", "")),
+            company_name=filing.get("companyName", ""),
+            form_type=filing.get("formType", ""),
+            accession_number=filing.get("accessionNo", ""),
+            cik=filing.get("cik", "")
+        )
     
     def get_company_filings(self, ticker: str, filing_types: List[str], 
-                           max_filings_per_type: int = 5) -> List[Dict]:
+                           max_filings_per_type: int = 5) -> List[FilingInfo]:
         """Get recent filings for a company across multiple filing types."""
         
-        all_filings = []
+        # Stays on the blocking client: asyncio.run() fails for callers that are
+        # already inside an event loop (notebooks, Streamlit, async apps)
+        logger.info("Searching %s filings for %s...", ', '.join(filing_types), ticker)
+        filings = self.search_filings_multi(ticker, filing_types)
+        grouped = self._group_filings_by_type(filings, filing_types, max_filings_per_type)
+        
+        # Ask for each cut-short type on its own
+        for filing_type in self._crowded_out_types(filings, grouped, filing_types, max_filings_per_type):
+            type_filings = self.search_filings(ticker, filing_type)
+            if len(type_filings) > len(grouped.get(filing_type, [])):
+                grouped[filing_type] = type_filings[:max_filings_per_type]
+        
+        return self._filing_infos(ticker, filing_types, grouped)
+    
+    def _filing_infos(self, ticker: str, filing_types: List[str],
+                      grouped: Dict[str, List[Dict]]) -> List[FilingInfo]:
+        """Flatten grouped search results into FilingInfo records in filing_types order."""
         
+        all_filings = []
         for filing_type in filing_types:
-            print(f"Searching {filing_type} filings for {ticker}...")
-            
-            filings = self.search_filings(ticker, filing_type)
-            
-            # Limit number of filings per type
-            limited_filings = filings[:max_filings_per_type]
-            
-            for filing in limited_filings:
-                # Use correct field names from sec-api.io response
-                filing_info = {
-                    "ticker": ticker,
-                    "filing_type": filing_type,
-                    "filing_date": filing.get("filedAt", ""),
-                    "filing_url": filing.get("linkToHtml", filing.get("linkToFilingDetails", "")),
-                    "company_name": filing.get("companyName", ""),
-                    "form_type": filing.get("formType", ""),
-                    "accession_number": filing.get("accessionNo", ""),
-                    "cik": filing.get("cik", "")
-                }
-                all_filings.append(filing_info)
+            for filing in grouped.get(filing_type, []):
+                all_filings.append(self._build_filing_info(ticker, filing_type, filing))
         
         return all_filings
     
@@ -189,155 +637,411 @@ class SECAPIClient:
         filings = self.get_company_filings(ticker, filing_types)
         downloaded_files = []
         
-        for filing in filings:
-            if filing["filing_url"]:
-                filepath = self.download_filing(
-                    filing["filing_url"],
-                    filing["ticker"],
-                    filing["filing_type"],
-                    filing["filing_date"]
+        # Workers block on the EDGAR token bucket, so the pool never exceeds the rate limit
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_downloads) as executor:
+            futures = [
+                executor.submit(
+                    self.download_filing,
+                    filing.filing_url,
+                    filing.ticker,
+                    filing.filing_type,
+                    filing.filing_date
                 )
+                for filing in filings if filing.filing_url
+            ]
+            
+            for future in as_completed(futures):
+                filepath = future.result()
                 if filepath:
                     downloaded_files.append(filepath)
         
         return downloaded_files
     
-    def _find_actual_filing_document(self, soup, filing_type: str) -> Optional[str]:
-        """Find the actual filing document link using multiple strategies."""
+    def _create_async_client(self) -> httpx.AsyncClient:
+        """Create an HTTP/2 client for concurrent requests within one event loop."""
         
-        # Strategy 1: Look for primary document based on filing type
-        primary_patterns = {
-            '10-K': ['10-k', 'annual report', 'form 10-k'],
-            '10-Q': ['10-q', 'quarterly report', 'form 10-q'],
-            '8-K': ['8-k', 'current report', 'form 8-k'],
-            'DEF 14A': ['def 14a', 'proxy statement', 'definitive proxy'],
-            '3': ['form 3', 'initial statement'],
-            '4': ['form 4', 'statement of changes'],
-            '5': ['form 5', 'annual statement']
-        }
+        return httpx.AsyncClient(
+            headers=dict(self.session.headers),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            http2=True,
+            timeout=30
+        )
+    
+    async def get_company_filings_async(self, ticker: str, filing_types: List[str],
+                                        max_filings_per_type: int = 5,
+                                        client: Optional[httpx.AsyncClient] = None) -> List[FilingInfo]:
+        """Search all filing types for a company with a single query."""
         
-        patterns = primary_patterns.get(filing_type, [filing_type.lower()])
+        if client is None:
+            async with self._create_async_client() as client:
+                return await self.get_company_filings_async(
+                    ticker, filing_types, max_filings_per_type, client
+                )
         
-        # Look for links with filing-specific text
-        for link in soup.find_all('a', href=True):
-            href = link.get('href', '')
-            link_text = link.get_text(strip=True).lower()
+        logger.info("Searching %s filings for %s...", ', '.join(filing_types), ticker)
+        # One query covers every filing type; split the results client-side
+        filings = await self.search_filings_multi_async(client, ticker, filing_types)
+        grouped = self._group_filings_by_type(filings, filing_types, max_filings_per_type)
+        
+        # Ask for each cut-short type on its own
+        crowded_out = self._crowded_out_types(filings, grouped, filing_types, max_filings_per_type)
+        type_results = await asyncio.gather(*[
+            self.search_filings_async(client, ticker, filing_type) for filing_type in crowded_out
+        ])
+        for filing_type, type_filings in zip(crowded_out, type_results):
+            if len(type_filings) > len(grouped.get(filing_type, [])):
+                grouped[filing_type] = type_filings[:max_filings_per_type]
+        
+        return self._filing_infos(ticker, filing_types, grouped)
+    
+    async def download_company_filings_async(self, ticker: str,
+                                             filing_types: List[str]) -> List[str]:
+        """Download all filings for a company with bounded concurrency."""
+        
+        async with self._create_async_client() as client:
+            filings = await self.get_company_filings_async(ticker, filing_types, client=client)
+            semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
             
-            if ('.htm' in href and '/Archives/edgar/data/' in href and
-                not href.endswith('-index.htm') and
-                not 'FilingSummary' in href and
-                not 'xslF345X03' in href):
+            results = await asyncio.gather(*[
+                self.download_filing_async(
+                    client,
+                    filing.filing_url,
+                    filing.ticker,
+                    filing.filing_type,
+                    filing.filing_date,
+                    semaphore=semaphore
+                )
+                for filing in filings if filing.filing_url
+            ])
+        
+        return [filepath for filepath in results if filepath]
+    
+    async def search_filings_async(self, client: httpx.AsyncClient, ticker: str,
+                                   filing_type: str,
+                                   start_date: str = "2022-01-01",
+                                   end_date: str = "2024-01-01",
+                                   use_cache: bool = True) -> List[Dict]:
+        """Async variant of search_filings."""
+        return await self.search_filings_multi_async(
+            client, ticker, [filing_type], start_date, end_date, use_cache
+        )
+    
+    async def search_filings_multi_async(self, client: httpx.AsyncClient, ticker: str,
+                                         filing_types: List[str],
+                                         start_date: str = "2022-01-01",
+                                         end_date: str = "2024-01-01",
+                                         use_cache: bool = True) -> List[Dict]:
+        """Async variant of search_filings_multi."""
+        
+        cache_key, label, query = self._prepare_search(ticker, filing_types, start_date, end_date)
+        if use_cache:
+            cached = self._cached_search_results(cache_key, ticker, label)
+            if cached is not None:
+                return cached
+        
+        try:
+            await self._search_bucket.acquire_async()
+            response = await client.post(
+                self.search_url,
+                headers=_SEC_API_HEADERS,
+                content=orjson.dumps(query)
+            )
+            return self._parse_search_response(response, cache_key, ticker, label)
+        
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+            logger.error("Error searching filings for %s %s: %s", ticker, label, e)
+            return []
+    
+    async def download_filing_async(self, client: httpx.AsyncClient, filing_url: str,
+                                    ticker: str, filing_type: str,
+                                    filing_date: str,
+                                    use_cache: bool = True,
+                                    semaphore: Optional[asyncio.Semaphore] = None) -> Optional[str]:
+        """Async variant of download_filing, optionally bounded by a shared semaphore."""
+        
+        # Filenames are deterministic, so a previous run's file can be reused as-is
+        filepath = self._filing_path(ticker, filing_type, filing_date)
+        if use_cache and self._is_downloaded(filepath):
+            logger.info("Cached: %s", os.path.basename(filepath))
+            return filepath
+        
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
+        
+        async with semaphore:
+            try:
+                # Reuse a previously resolved document link if we have one
+                document_url = self._document_links.get(filing_url) if use_cache else None
+                
+                if document_url is None:
+                    # First, get the filing detail page
+                    await self._edgar_bucket.acquire_async()
+                    response = await client.get(filing_url)
+                    response.raise_for_status()
+                    
+                    document_url = self._select_document_url(response.content, filing_url, filing_type)
+                    self._cache_document_link(filing_url, document_url)
                 
-                # Check if link text matches filing type patterns
-                if any(pattern in link_text for pattern in patterns):
-                    return href
+                if document_url:
+                    # Stream the document to disk instead of buffering it
+                    await self._edgar_bucket.acquire_async()
+                    async with client.stream("GET", document_url,
+                                             headers=self._conditional_headers(document_url)) as doc_response:
+                        if doc_response.status_code == 304:
+                            return self._not_modified(document_url)
+                        doc_response.raise_for_status()
+                        prefix = await self._stream_to_file_async(
+                            doc_response.aiter_bytes(self.STREAM_CHUNK_SIZE), filepath
+                        )
+                    self._remember_validators(document_url, doc_response.headers, filepath)
+                    self._report_filing_content(prefix, filing_type)
+                    self._dir_index = None
+                    logger.info("Downloaded: %s", os.path.basename(filepath))
+                    return filepath
                 
-                # Check for "complete submission text file" which is often the main document
-                if 'complete submission text file' in link_text:
-                    return href
+                # Last resort - use the detail page content
+                return self._save_filing(response.text, ticker, filing_type, filing_date)
+            
+            except httpx.HTTPError as e:
+                logger.error("Error downloading filing %s: %s", filing_url, e)
+                return None
+    
+    def _extract_links(self, detail_html: bytes) -> List[Tuple[str, str]]:
+        """Extract (href, lowercased link text) pairs for EDGAR archive documents."""
         
-        # Strategy 2: Look for the first substantial .htm document
-        for link in soup.find_all('a', href=True):
-            href = link.get('href', '')
+        links = []
+        for match in _ANCHOR_RE.finditer(detail_html):
+            href = html.unescape(match.group(1).decode('utf-8', errors='ignore'))
+            
+            # Both document strategies only consider archive links, so skip
+            # navigation anchors before paying for link-text cleanup
+            if '/Archives/edgar/data/' not in href:
+                continue
             
+            text = _TAG_RE.sub(b' ', match.group(2)).decode('utf-8', errors='ignore')
+            link_text = _WHITESPACE_RE.sub(' ', html.unescape(text)).strip().lower()
+            links.append((href, link_text))
+        
+        return links
+    
+    def _find_actual_filing_document(self, links: List[Tuple[str, str]],
+                                     filing_type: str) -> Optional[str]:
+        """Find the actual filing document link using multiple strategies."""
+        
+        # Strategy 1: Look for primary document based on filing type
+        patterns = _PRIMARY_PATTERNS.get(filing_type, (filing_type.lower(),))
+        
+        # Both strategies share the same href filter, so apply it once
+        candidates = [
+            (href, link_text) for href, link_text in links
             if ('.htm' in href and '/Archives/edgar/data/' in href and
                 not href.endswith('-index.htm') and
                 not 'FilingSummary' in href and
-                not 'xslF345X03' in href and
-                not 'R1.htm' in href and  # Skip exhibits
-                not 'R2.htm' in href):
+                not 'xslF345X03' in href)
+        ]
+        
+        # Look for links with filing-specific text
+        for href, link_text in candidates:
+            # Check if link text matches filing type patterns
+            if any(pattern in link_text for pattern in patterns):
+                return href
+            
+            # Check for "complete submission text file" which is often the main document
+            if 'complete submission text file' in link_text:
+                return href
+        
+        # Strategy 2: Look for the first substantial .htm document
+        for href, _ in candidates:
+            if not 'R1.htm' in href and not 'R2.htm' in href:  # Skip exhibits
                 return href
         
         return None
     
-    def _find_text_version(self, soup) -> Optional[str]:
+    def _find_text_version(self, links: List[Tuple[str, str]]) -> Optional[str]:
         """Find text version of the filing as fallback."""
         
-        for link in soup.find_all('a', href=True):
-            href = link.get('href', '')
-            link_text = link.get_text(strip=True).lower()
-            
+        for href, link_text in links:
             if ('.txt' in href and '/Archives/edgar/data/' in href and
                 ('complete submission text file' in link_text or 'text' in link_text)):
                 return href
         
         return None
     
-    def _construct_document_url(self, document_link: str) -> str:
-        """Construct full document URL from relative link."""
-        
-        if document_link.startswith('http'):
-            return document_link
-        elif document_link.startswith('/'):
-            return f"https://www.sec.gov{document_link}"
-        else:
-            return f"https://www.sec.gov/{document_link}"
-    
-    def _validate_filing_content(self, content: str, filing_type: str) -> bool:
-        """Validate that content is actual SEC filing, not XBRL viewer page."""
+    def _validate_filing_content(self, content: bytes, filing_type: str) -> bool:
+        """Validate that a document prefix is actual SEC filing, not XBRL viewer page."""
         
+        # Work on raw bytes so the prefix never has to be decoded
         content_lower = content.lower()
         
-        # Check for XBRL viewer indicators (bad signs)
-        xbrl_indicators = [
-            'xbrl viewer',
-            'ixviewer',
-            'loadviewer',
-            'javascript',
-            'iframe',
-            'this page uses javascript'
-        ]
-        
-        xbrl_count = sum(1 for indicator in xbrl_indicators if indicator in content_lower)
+        # Only the 500/1000-word thresholds matter, so stop splitting past 1000 words
+        word_count = len(content.split(None, 1000))
         
         # If too many XBRL indicators and short content, likely a viewer page
-        if xbrl_count >= 3 and len(content.split()) < 1000:
-            return False
+        if word_count < 1000:
+            xbrl_count = sum(1 for indicator in _XBRL_INDICATORS if indicator in content_lower)
+            if xbrl_count >= 3:
+                return False
         
         # Check for actual filing content indicators (good signs)
-        filing_indicators = {
-            '10-K': ['annual report', 'business overview', 'risk factors', 'management discussion'],
-            '10-Q': ['quarterly report', 'financial statements', 'condensed consolidated'],
-            '8-K': ['current report', 'item 1', 'item 2', 'signature'],
-            'DEF 14A': ['proxy statement', 'annual meeting', 'executive compensation'],
-            '3': ['initial statement', 'beneficial ownership'],
-            '4': ['statement of changes', 'securities acquired'],
-            '5': ['annual statement', 'securities beneficially owned']
-        }
+        expected_indicators = _FILING_INDICATORS.get(filing_type, _DEFAULT_FILING_INDICATORS)
         
-        expected_indicators = filing_indicators.get(filing_type, ['sec filing', 'securities'])
-        filing_content_count = sum(1 for indicator in expected_indicators if indicator in content_lower)
-        
-        # Good content should have filing-specific indicators and reasonable length
-        return filing_content_count > 0 and len(content.split()) > 500
+        # Good content should have filing-specific indicators and reasonable length;
+        # any() stops at the first indicator found
+        return word_count > 500 and any(indicator in content_lower for indicator in expected_indicators)
+    
+    def _load_json_cache(self, cache_file: str) -> Dict:
+        """Load a JSON cache file, returning an empty cache if unavailable."""
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'rb') as f:
+                    return orjson.loads(f.read())
+            except Exception as e:
+                logger.warning("Error loading cache %s: %s", cache_file, e)
+        return {}
+    
+    def _write_json_cache(self, cache_file: str, cache_data: Dict):
+        """Persist a JSON cache file. Callers must hold the cache lock."""
+        try:
+            with open(cache_file, 'wb') as f:
+                f.write(orjson.dumps(cache_data))
+        except Exception as e:
+            logger.warning("Error saving cache %s: %s", cache_file, e)
+    
+    def _search_cache_key(self, ticker: str, filing_types: str,
+                          start_date: str, end_date: str) -> str:
+        """Key search results by ticker, filing type(s) and date range."""
+        return f"{ticker}|{filing_types}|{start_date}|{end_date}"
+    
+    def _load_search_cache(self) -> OrderedDict:
+        """Load fresh search results, least recently stored first."""
+        now = time.time()
+        entries = self._load_json_cache(self._search_cache_file).items()
+        fresh = [
+            (key, entry) for key, entry in entries
+            if now - entry.get('cached_at', 0) < self.SEARCH_CACHE_TTL
+        ]
+        fresh.sort(key=lambda item: item[1].get('cached_at', 0))
+        return OrderedDict(fresh[-self.SEARCH_CACHE_MAX_ENTRIES:])
+    
+    def _get_cached_search(self, cache_key: str) -> Optional[List[Dict]]:
+        """Return cached search results if they are still fresh."""
+        with self._cache_lock:
+            entry = self._search_cache.get(cache_key)
+            if entry is None:
+                return None
+            if time.time() - entry.get('cached_at', 0) >= self.SEARCH_CACHE_TTL:
+                del self._search_cache[cache_key]
+                return None
+            self._search_cache.move_to_end(cache_key)
+            return entry['filings']
+    
+    def _cache_search(self, cache_key: str, filings: List[Dict]):
+        """Store search results in the bounded on-disk cache."""
+        with self._cache_lock:
+            self._search_cache[cache_key] = {'cached_at': time.time(), 'filings': filings}
+            self._search_cache.move_to_end(cache_key)
+            while len(self._search_cache) > self.SEARCH_CACHE_MAX_ENTRIES:
+                self._search_cache.popitem(last=False)
+            self._write_json_cache(self._search_cache_file, self._search_cache)
+    
+    def _cache_document_link(self, filing_url: str, document_url: Optional[str]):
+        """Remember which document a filing detail page resolved to."""
+        if not document_url:
+            return
+        with self._cache_lock:
+            self._document_links[filing_url] = document_url
+            self._write_json_cache(self._document_link_file, self._document_links)
+    
+    def _conditional_headers(self, url: str) -> Dict:
+        """If-None-Match/If-Modified-Since headers for a URL we still have on disk."""
+        entry = self._etags.get(url)
+        if not entry or not os.path.exists(entry["filepath"]):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+    
+    def _remember_validators(self, url: str, response_headers, filepath: str):
+        """Store the ETag/Last-Modified a download was served with."""
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        with self._cache_lock:
+            self._etags[url] = {"etag": etag, "last_modified": last_modified, "filepath": filepath}
+            self._write_json_cache(self._etag_file, self._etags)
+    
+    def _not_modified(self, url: str) -> str:
+        """Handle a 304 response by reusing the previously downloaded file."""
+        filepath = self._etags[url]["filepath"]
+        logger.info("Not modified: %s", os.path.basename(filepath))
+        return filepath
     
     def _load_request_count(self):
         """Load request count from cache file."""
         cache_file = os.path.join(RAW_DATA_DIR, '.request_cache.json')
         if os.path.exists(cache_file):
             try:
-                with open(cache_file, 'r') as f:
-                    cache_data = json.load(f)
+                with open(cache_file, 'rb') as f:
+                    cache_data = orjson.loads(f.read())
                     today = datetime.now().strftime('%Y-%m-%d')
                     if cache_data.get('date') == today:
                         self.request_count = cache_data.get('count', 0)
-                        print(f"Loaded request count: {self.request_count}/{self.max_requests_per_day}")
+                        logger.info("Loaded request count: %d/%d", self.request_count, self.max_requests_per_day)
             except Exception as e:
-                print(f"Error loading request cache: {e}")
+                logger.warning("Error loading request cache: %s", e)
+    
+    def _record_request(self):
+        """Count one sec-api.io request, persisting the total at most every few seconds."""
+        with self._count_lock:
+            self.request_count += 1
+            self._unsaved_requests += 1
+            self._count_dirty = True
+            due = time.monotonic() - self._last_count_save >= self.REQUEST_COUNT_SAVE_INTERVAL
+        if due:
+            self._save_request_count()
     
     def _save_request_count(self):
-        """Save request count to cache file."""
+        """Merge unsaved requests into the on-disk count and replace the file atomically."""
         cache_file = os.path.join(RAW_DATA_DIR, '.request_cache.json')
-        os.makedirs(RAW_DATA_DIR, exist_ok=True)
-        try:
-            cache_data = {
-                'date': datetime.now().strftime('%Y-%m-%d'),
-                'count': self.request_count
-            }
-            with open(cache_file, 'w') as f:
-                json.dump(cache_data, f)
-        except Exception as e:
-            print(f"Error saving request cache: {e}")
+        with self._count_lock:
+            if not self._count_dirty:
+                return
+            
+            lock_file = None
+            try:
+                # Serialize the read-modify-write against other processes
+                if fcntl is not None:
+                    lock_file = open(cache_file + '.lock', 'w')
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                
+                today = datetime.now().strftime('%Y-%m-%d')
+                disk_count = 0
+                if os.path.exists(cache_file):
+                    with open(cache_file, 'rb') as f:
+                        cache_data = orjson.loads(f.read())
+                    if cache_data.get('date') == today:
+                        disk_count = cache_data.get('count', 0)
+                
+                # Other processes may have spent part of today's budget as well
+                self.request_count = max(self.request_count, disk_count + self._unsaved_requests)
+                
+                tmp_file = cache_file + '.tmp'
+                with open(tmp_file, 'wb') as f:
+                    f.write(orjson.dumps({'date': today, 'count': self.request_count}))
+                os.replace(tmp_file, cache_file)
+                
+                self._unsaved_requests = 0
+                self._count_dirty = False
+                self._last_count_save = time.monotonic()
+            except Exception as e:
+                logger.warning("Error saving request cache: %s", e)
+            finally:
+                if lock_file is not None:
+                    lock_file.close()
     
     def _can_make_request(self) -> bool:
         """Check if we can make another API request."""
@@ -348,25 +1052,95 @@ class SECAPIClient:
                                    end_date: str = "2024-01-01") -> List[Dict]:
         """Search for SEC filings with fallback to direct EDGAR access."""
         
+        filings = self._search_filings_via_api(ticker, filing_type, start_date, end_date)
+        if filings:
+            return filings
+        
+        # Fallback to direct EDGAR RSS feeds or existing data
+        logger.info("Using fallback method for %s %s", ticker, filing_type)
+        return self._fallback_search_filings(ticker, filing_type, start_date, end_date)
+    
+    def _search_filings_via_api(self, ticker: str, filing_type: str,
+                                start_date: str, end_date: str) -> List[Dict]:
+        """Cached or sec-api.io results for one filing type, or [] when there are none."""
+        
+        # Cached results weren't real API calls, so they don't count against the budget
+        cached = self._get_cached_search(self._search_cache_key(ticker, filing_type, start_date, end_date))
+        if cached:
+            logger.info("Using cached search results for %s %s", ticker, filing_type)
+            return cached
+        
         # Try API first if we have requests left
         if self.api_key and self._can_make_request():
             try:
                 filings = self.search_filings(ticker, filing_type, start_date, end_date)
                 if filings:
-                    self.request_count += 1
-                    self._save_request_count()
+                    self._record_request()
                     return filings
-            except requests.exceptions.HTTPError as e:
+            except httpx.HTTPStatusError as e:
                 if e.response.status_code == 429:
-                    print(f"API rate limit reached. Switching to fallback method.")
-                    self.request_count = self.max_requests_per_day
+                    logger.warning("API rate limit reached. Switching to fallback method.")
+                    with self._count_lock:
+                        self.request_count = self.max_requests_per_day
+                        self._count_dirty = True
                     self._save_request_count()
                 else:
-                    print(f"API error: {e}")
+                    logger.error("API error: %s", e)
         
-        # Fallback to direct EDGAR RSS feeds or existing data
-        print(f"Using fallback method for {ticker} {filing_type}")
-        return self._fallback_search_filings(ticker, filing_type, start_date, end_date)
+        return []
+    
+    def search_filings_multi_with_fallback(self, ticker: str, filing_types: List[str],
+                                           start_date: str = "2022-01-01",
+                                           end_date: str = "2024-01-01",
+                                           max_filings_per_type: int = 5) -> Dict[str, List[Dict]]:
+        """Search all filing types for a ticker with one API request, falling back per type."""
+        
+        filings = []
+        
+        # Cached results weren't real API calls, so they don't count against the budget
+        cached = self._get_cached_search(
+            self._search_cache_key(ticker, "/".join(filing_types), start_date, end_date)
+        )
+        if cached:
+            logger.info("Using cached search results for %s %s", ticker, "/".join(filing_types))
+            filings = cached
+        
+        # One API request covers every filing type
+        elif self.api_key and self._can_make_request():
+            try:
+                filings = self.search_filings_multi(ticker, filing_types, start_date, end_date)
+                if filings:
+                    self._record_request()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 429:
+                    logger.warning("API rate limit reached. Switching to fallback method.")
+                    with self._count_lock:
+                        self.request_count = self.max_requests_per_day
+                        self._count_dirty = True
+                    self._save_request_count()
+                else:
+                    logger.error("API error: %s", e)
+        
+        grouped = self._group_filings_by_type(filings, filing_types, max_filings_per_type)
+        
+        # Ask for each cut-short type on its own before settling for the fallback
+        for filing_type in self._crowded_out_types(filings, grouped, filing_types, max_filings_per_type):
+            type_filings = self._search_filings_via_api(ticker, filing_type, start_date, end_date)
+            if len(type_filings) > len(grouped.get(filing_type, [])):
+                grouped[filing_type] = type_filings[:max_filings_per_type]
+        
+        results = {}
+        for filing_type in filing_types:
+            if grouped.get(filing_type):
+                results[filing_type] = grouped[filing_type]
+            else:
+                # Fallback to direct EDGAR RSS feeds or existing data
+                logger.info("Using fallback method for %s %s", ticker, filing_type)
+                results[filing_type] = self._fallback_search_filings(
+                    ticker, filing_type, start_date, end_date
+                )[:max_filings_per_type]
+        
+        return results
     
     def _fallback_search_filings(self, ticker: str, filing_type: str,
                                start_date: str, end_date: str) -> List[Dict]:
@@ -375,7 +1149,7 @@ class SECAPIClient:
         # Check if we already have downloaded files for this company/filing type
         existing_files = self._find_existing_files(ticker, filing_type)
         if existing_files:
-            print(f"Found {len(existing_files)} existing files for {ticker} {filing_type}")
+            logger.info("Found %d existing files for %s %s", len(existing_files), ticker, filing_type)
             return existing_files
         
         # Try to construct filing URLs based on known patterns
@@ -397,65 +1171,97 @@ class SECAPIClient:
                     "company_name": f"{ticker} Inc.",
                     "form_type": filing_type,
                     "accession_number": f"0000000000-{year}-000001",
-                    "cik": "0000000000"
+                    "cik": "0000000000",
+                    "guessed_url": True
                 }
                 fallback_filings.append(filing_info)
         
         return fallback_filings[:3]  # Limit to 3 fallback filings
     
-    def _find_existing_files(self, ticker: str, filing_type: str) -> List[Dict]:
-        """Find existing downloaded files for a company/filing type."""
+    def _rebuild_dir_index(self) -> Dict[Tuple[str, str], List[str]]:
+        """Index downloaded filings by (ticker, filing_type) with a single directory scan."""
         
-        existing_files = []
+        dir_index = {}
         
         if os.path.exists(RAW_DATA_DIR):
-            for filename in os.listdir(RAW_DATA_DIR):
-                # Handle both underscore and dash patterns in filing types
-                pattern1 = f"{ticker}_{filing_type}_"
-                pattern2 = f"{ticker}_{filing_type.replace('-', '')}_"  # Handle 10K vs 10-K
-                
-                if ((filename.startswith(pattern1) or filename.startswith(pattern2)) and 
-                    filename.endswith('.html')):
+            with os.scandir(RAW_DATA_DIR) as entries:
+                for entry in entries:
+                    filename = entry.name
+                    if not filename.endswith('.html'):
+                        continue
                     
-                    # Extract date from filename
-                    parts = filename.replace('.html', '').split('_')
+                    # Filenames look like {ticker}_{filing_type}_{YYYYMMDD}.html
+                    parts = filename[:-len('.html')].split('_')
                     if len(parts) >= 3:
                         date_part = parts[-1]  # Last part should be the date
                         
                         # Validate date format (YYYYMMDD)
                         if len(date_part) == 8 and date_part.isdigit():
-                            filing_info = {
-                                "ticker": ticker,
-                                "filing_type": filing_type,
-                                "filing_date": f"{date_part[:4]}-{date_part[4:6]}-{date_part[6:8]}",
-                                "filing_url": f"file://{os.path.join(RAW_DATA_DIR, filename)}",
-                                "company_name": f"{ticker} Inc.",
-                                "form_type": filing_type,
-                                "accession_number": "existing",
-                                "cik": "existing",
-                                "local_file": True
-                            }
-                            existing_files.append(filing_info)
+                            dir_index.setdefault((parts[0], parts[1]), []).append(filename)
+        
+        self._dir_index = dir_index
+        return dir_index
+    
+    def _find_existing_files(self, ticker: str, filing_type: str) -> List[Dict]:
+        """Find existing downloaded files for a company/filing type."""
+        
+        dir_index = self._dir_index if self._dir_index is not None else self._rebuild_dir_index()
+        
+        # Handle both underscore and dash patterns in filing types (10K vs 10-K)
+        filenames = list(dir_index.get((ticker, filing_type), []))
+        compact_type = filing_type.replace('-', '')
+        if compact_type != filing_type:
+            filenames.extend(dir_index.get((ticker, compact_type), []))
+        
+        existing_files = []
+        for filename in filenames:
+            date_part = filename[:-len('.html')].rsplit('_', 1)[-1]
+            filing_info = {
+                "ticker": ticker,
+                "filing_type": filing_type,
+                "filing_date": f"{date_part[:4]}-{date_part[4:6]}-{date_part[6:8]}",
+                "filing_url": f"file://{os.path.join(RAW_DATA_DIR, filename)}",
+                "company_name": f"{ticker} Inc.",
+                "form_type": filing_type,
+                "accession_number": "existing",
+                "cik": "existing",
+                "local_file": True
+            }
+            existing_files.append(filing_info)
         
         return existing_files
     
     def download_filing_enhanced(self, filing_url: str, ticker: str,
-                               filing_type: str, filing_date: str) -> Optional[str]:
+                               filing_type: str, filing_date: str,
+                               guessed_url: bool = False) -> Optional[str]:
         """Enhanced filing download with multiple strategies."""
         
         # If it's a local file, just return the path
         if filing_url.startswith('file://'):
             local_path = filing_url.replace('file://', '')
             if os.path.exists(local_path):
-                print(f"Using existing local file: {local_path}")
+                logger.info("Using existing local file: %s", local_path)
                 return local_path
         
-        # Try multiple download strategies
-        strategies = [
-            self._download_via_direct_link,
-            self._download_via_text_version,
-            self._download_via_rss_feed
-        ]
+        # A previous run's file needs no network request at all, not even a probe
+        filepath = self._filing_path(ticker, filing_type, filing_date)
+        if self._is_downloaded(filepath):
+            logger.info("Cached: %s", os.path.basename(filepath))
+            return filepath
+        
+        # URLs guessed by _fallback_search_filings may not exist; a HEAD probe
+        # rules the direct link out without downloading an error page
+        if guessed_url and not self._probe_url(filing_url):
+            strategies = [
+                self._download_via_text_version,
+                self._download_via_rss_feed
+            ]
+        else:
+            strategies = [
+                self._download_via_direct_link,
+                self._download_via_text_version,
+                self._download_via_rss_feed
+            ]
         
         for strategy in strategies:
             try:
@@ -463,12 +1269,26 @@ class SECAPIClient:
                 if result:
                     return result
             except Exception as e:
-                print(f"Strategy failed: {e}")
+                logger.warning("Strategy failed: %s", e)
                 continue
         
-        print(f"All download strategies failed for {ticker} {filing_type}")
+        logger.error("All download strategies failed for %s %s", ticker, filing_type)
         return None
     
+    def _probe_url(self, url: str) -> bool:
+        """HEAD a URL to check it exists; unknown outcomes are left to the real GET."""
+        
+        try:
+            self._edgar_bucket.acquire()
+            probe = self.session.head(url, allow_redirects=True, timeout=5)
+        except requests.exceptions.RequestException:
+            return True
+        
+        if probe.status_code >= 400:
+            logger.info("Skipping direct link, HEAD returned %d: %s", probe.status_code, url)
+            return False
+        return True
+    
     def _download_via_direct_link(self, filing_url: str, ticker: str,
                                 filing_type: str, filing_date: str) -> Optional[str]:
         """Download via direct link (original method)."""
@@ -483,29 +1303,31 @@ class SECAPIClient:
             if '.htm' in filing_url:
                 text_url = filing_url.replace('.htm', '.txt')
                 
-                headers = {
-                    'User-Agent': 'SEC Filing QA Agent research@example.com',
-                    'Accept': 'text/plain'
-                }
-                
-                response = self.session.get(text_url, headers=headers)
-                response.raise_for_status()
-                
                 # Create filename
                 safe_date = filing_date.replace("-", "").replace("T", "_").split("_")[0]
                 filename = f"{ticker}_{filing_type}_{safe_date}.txt"
                 filepath = os.path.join(RAW_DATA_DIR, filename)
                 
-                os.makedirs(RAW_DATA_DIR, exist_ok=True)
-                
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(response.text)
+                # Full submission text files are large; stream them straight to disk
+                self._edgar_bucket.acquire()
+                with self.session.get(
+                    text_url, headers={**_EDGAR_TEXT_HEADERS, **self._conditional_headers(text_url)},
+                    stream=True
+                ) as response:
+                    if response.status_code == 304:
+                        return self._not_modified(text_url)
+                    response.raise_for_status()
+                    prefix = self._stream_to_file(
+                        response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE), filepath
+                    )
+                self._remember_validators(text_url, response.headers, filepath)
+                self._report_filing_content(prefix, filing_type)
                 
-                print(f"Downloaded text version: {filename}")
+                logger.info("Downloaded text version: %s", filename)
                 return filepath
                 
         except Exception as e:
-            print(f"Text version download failed: {e}")
+            logger.warning("Text version download failed: %s", e)
             return None
     
     def _download_via_rss_feed(self, filing_url: str, ticker: str,
@@ -514,5 +1336,5 @@ class SECAPIClient:
         
         # This would implement RSS feed lookup
         # For now, just return None to indicate this strategy failed
-        print("RSS feed strategy not implemented yet")
+        logger.debug("RSS feed strategy not implemented yet")
         return None
\ No newline at end of file
@@ -1,19 +1,141 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, Union
+import numpy as np
 import re
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from types import MappingProxyType
+from itertools import islice
 import os
+import sys
 
 try:
     from .html_parser import HTMLParser
     from .filing_processors import FilingProcessorFactory
-    from config.settings import CHUNK_SIZE, CHUNK_OVERLAP
+    from config.settings import CHUNK_SIZE, CHUNK_OVERLAP, MAX_CHUNKING_WORKERS
 except ImportError:
     from document_processing.html_parser import HTMLParser
     from document_processing.filing_processors import FilingProcessorFactory
-    from src.config.settings import CHUNK_SIZE, CHUNK_OVERLAP
+    from src.config.settings import CHUNK_SIZE, CHUNK_OVERLAP, MAX_CHUNKING_WORKERS
 
 
-@dataclass
+# Financial concept patterns, compiled once and matched case-insensitively
+_CONCEPT_PATTERNS = {
+    concept: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+    for concept, patterns in {
+        "revenue_growth": [r"revenue.*growth", r"sales.*growth", r"top.*line.*growth"],
+        "profitability": [r"profit.*margin", r"operating.*margin", r"net.*income"],
+        "liquidity": [r"cash.*flow", r"working.*capital", r"liquidity"],
+        "debt": [r"debt.*ratio", r"leverage", r"borrowing"],
+        "market_share": [r"market.*share", r"competitive.*position"],
+        "innovation": [r"research.*development", r"r&d", r"innovation"],
+        "risk_management": [r"risk.*management", r"hedging", r"insurance"],
+        "acquisitions": [r"acquisition", r"merger", r"m&a"],
+        "dividends": [r"dividend", r"share.*repurchase", r"buyback"],
+        "guidance": [r"guidance", r"outlook", r"forecast"]
+    }.items()
+}
+
+# Substring indicators shared by the validation and scoring helpers,
+# matched against the lowercased UTF-8 bytes of a filing
+_INDEX_INDICATORS = (
+    b'filing detail',
+    b'edgar filing documents',
+    b'sec.gov',
+    b'latest filings',
+    b'filings search tools',
+    b'this page uses javascript',
+    b'edgar-logo'
+)
+
+_XBRL_INDICATORS = (
+    b'xbrl viewer', b'ixviewer', b'loadviewer', b'javascript',
+    b'iframe', b'this page uses javascript', b'edgar-logo',
+    b'filing detail', b'edgar filing documents'
+)
+
+_FILING_INDICATORS = MappingProxyType({
+    '10-K': (
+        b'annual report', b'business overview', b'risk factors', 
+        b'management discussion', b'financial statements', b'consolidated statements',
+        b'item 1', b'item 2', b'item 3', b'part i', b'part ii'
+    ),
+    '10-Q': (
+        b'quarterly report', b'financial statements', b'condensed consolidated',
+        b'management discussion', b'item 1', b'item 2', b'part i', b'part ii'
+    ),
+    '8-K': (
+        b'current report', b'item 1', b'item 2', b'item 3', b'item 4',
+        b'item 5', b'item 7', b'item 8', b'item 9', b'signature'
+    ),
+    'DEF 14A': (
+        b'proxy statement', b'annual meeting', b'executive compensation',
+        b'board of directors', b'shareholder', b'voting', b'proposal'
+    ),
+    '3': (b'initial statement', b'beneficial ownership', b'securities owned'),
+    '4': (b'statement of changes', b'securities acquired', b'securities disposed'),
+    '5': (b'annual statement', b'securities beneficially owned')
+})
+
+_DEFAULT_FILING_INDICATORS = (b'sec filing', b'securities', b'company')
+
+_FINANCIAL_TERMS = (
+    b'revenue', b'income', b'profit', b'loss', b'earnings', b'cash flow',
+    b'assets', b'liabilities', b'equity', b'debt', b'investment',
+    b'financial', b'fiscal', b'quarter', b'annual', b'million', b'billion',
+    b'percent', b'percentage', b'growth', b'decline', b'increase', b'decrease'
+)
+
+# Terms that count double in the financial content score
+_WEIGHTED_FINANCIAL_TERMS = frozenset([b'revenue', b'income', b'profit', b'earnings', b'cash flow'])
+
+_FINANCIAL_KEYWORDS = (
+    "revenue", "income", "profit", "loss", "earnings", "cash flow",
+    "assets", "liabilities", "equity", "debt", "investment", "growth",
+    "margin", "ratio", "performance", "results", "operations"
+)
+
+_BUSINESS_KEYWORDS = (
+    "strategy", "market", "competition", "customer", "product", "service",
+    "technology", "innovation", "acquisition", "merger", "expansion",
+    "risk", "opportunity", "challenge", "outlook", "guidance"
+)
+
+_KEYWORDS = _FINANCIAL_KEYWORDS + _BUSINESS_KEYWORDS
+
+# Company names for citations (simplified mapping)
+_COMPANY_NAMES = MappingProxyType({
+    "AAPL": "Apple Inc.",
+    "MSFT": "Microsoft Corporation", 
+    "GOOGL": "Alphabet Inc.",
+    "AMZN": "Amazon.com Inc.",
+    "TSLA": "Tesla Inc.",
+    "JPM": "JPMorgan Chase & Co.",
+    "BAC": "Bank of America Corporation",
+    "WFC": "Wells Fargo & Company",
+    "JNJ": "Johnson & Johnson",
+    "PFE": "Pfizer Inc.",
+    "XOM": "Exxon Mobil Corporation",
+    "CVX": "Chevron Corporation",
+    "WMT": "Walmart Inc.",
+    "GE": "General Electric Company",
+    "CAT": "Caterpillar Inc.",
+    "BA": "The Boeing Company"
+})
+
+
+# slots=True needs Python 3.10; older interpreters fall back to a regular dataclass
+# (explicit __slots__ would clash with the field defaults)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Row lookup result for values a ChunkTable has never seen
+_NO_ROWS = np.empty(0, dtype=np.intp)
+
+# Below this many files iter_chunks stays in-process unless max_workers is given
+_MIN_PARALLEL_FILES = 10
+
+
+@dataclass(**_SLOTS)
 class DocumentChunk:
     content: str  # Changed from 'text' to 'content' for consistency
     metadata: Dict
@@ -22,6 +144,71 @@ class DocumentChunk:
     end_position: int = 0
 
 
+@dataclass
+class ChunkTable:
+    """Column-per-field view of chunk metadata for fast filtering."""
+    chunks: List[DocumentChunk]
+    tickers: np.ndarray
+    filing_types: np.ndarray
+    filing_dates: np.ndarray
+    word_counts: np.ndarray
+    # Row indexes built once so lookups don't rescan the columns
+    ticker_rows: Dict[str, np.ndarray]
+    filing_type_rows: Dict[str, np.ndarray]
+    date_order: np.ndarray
+    sorted_dates: np.ndarray
+    
+    @classmethod
+    def from_chunks(cls, chunks: List[DocumentChunk]) -> 'ChunkTable':
+        """Build the metadata columns and row indexes from a list of chunks."""
+        
+        metadata = [chunk.metadata for chunk in chunks]
+        tickers = np.array([m.get('ticker', '') for m in metadata], dtype=str)
+        filing_types = np.array([m.get('filing_type', '') for m in metadata], dtype=str)
+        filing_dates = np.array([m.get('filing_date', '') for m in metadata], dtype=str)
+        date_order = np.argsort(filing_dates, kind='stable')
+        return cls(
+            chunks=list(chunks),
+            tickers=tickers,
+            filing_types=filing_types,
+            filing_dates=filing_dates,
+            word_counts=np.array([m.get('chunk_word_count', 0) for m in metadata], dtype=np.int64),
+            ticker_rows=_group_rows(tickers),
+            filing_type_rows=_group_rows(filing_types),
+            date_order=date_order,
+            sorted_dates=filing_dates[date_order]
+        )
+    
+    def __len__(self) -> int:
+        return len(self.chunks)
+    
+    def select(self, mask: np.ndarray) -> List[DocumentChunk]:
+        """Return the chunks where the boolean mask is set."""
+        
+        return self.take(np.flatnonzero(mask))
+    
+    def take(self, rows: np.ndarray) -> List[DocumentChunk]:
+        """Return the chunks at the given row numbers."""
+        
+        return [self.chunks[i] for i in rows.tolist()]
+    
+    def date_range_rows(self, start_date: str, end_date: str) -> np.ndarray:
+        """Row numbers, in chunk order, of filings dated within [start_date, end_date]."""
+        
+        first = np.searchsorted(self.sorted_dates, start_date, side='left')
+        last = np.searchsorted(self.sorted_dates, end_date, side='right')
+        return np.sort(self.date_order[first:last])
+
+
+def _group_rows(column: np.ndarray) -> Dict[str, np.ndarray]:
+    """Map each distinct value of a column to the ascending rows that hold it."""
+    
+    values, inverse = np.unique(column, return_inverse=True)
+    order = np.argsort(inverse, kind='stable')
+    bounds = np.cumsum(np.bincount(inverse, minlength=len(values)))[:-1]
+    return dict(zip(values.tolist(), np.split(order, bounds)))
+
+
 class DocumentChunker:
     def __init__(self, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP):
         self.chunk_size = chunk_size
@@ -66,38 +253,35 @@ class DocumentChunker:
         metadata = {}
         
         if len(parts) >= 3:
-            metadata['ticker'] = parts[0]
-            metadata['filing_type'] = parts[1]
-            metadata['filing_date'] = parts[2]
+            # Interned so every chunk of every filing shares one copy of each value
+            metadata['ticker'] = sys.intern(parts[0])
+            metadata['filing_type'] = sys.intern(parts[1])
+            metadata['filing_date'] = sys.intern(parts[2])
         
         return metadata
 
     def _is_index_page(self, text: str) -> bool:
         """Check if the text appears to be an SEC index page rather than actual filing content."""
 
-        # Convert to lowercase for case-insensitive matching
-        text_lower = text.lower()
-
-        # Common indicators of SEC index pages
-        index_indicators = [
-            'filing detail',
-            'edgar filing documents',
-            'sec.gov',
-            'latest filings',
-            'filings search tools',
-            'this page uses javascript',
-            'edgar-logo'
-        ]
+        # Lowercase the encoded text for case-insensitive matching
+        text_lower = text.encode('utf-8', 'ignore').lower()
 
         # Count how many indicators are present
-        indicator_count = sum(1 for indicator in index_indicators if indicator in text_lower)
+        indicator_count = sum(1 for indicator in _INDEX_INDICATORS if indicator in text_lower)
+
+        # Check for specific SEC index page patterns
+        is_filing_detail = b'filing detail' in text_lower and b'edgar' in text_lower
+
+        # Only split into words once a pattern has matched
+        if indicator_count < 3 and not is_filing_detail:
+            return False
+        word_count = len(text.split())
 
         # If we have multiple indicators and the text is short, it's likely an index page
-        if indicator_count >= 3 and len(text.split()) < 1000:
+        if indicator_count >= 3 and word_count < 1000:
             return True
 
-        # Check for specific SEC index page patterns
-        if 'filing detail' in text_lower and 'edgar' in text_lower and len(text.split()) < 500:
+        if is_filing_detail and word_count < 500:
             return True
 
         return False
@@ -108,28 +292,34 @@ class DocumentChunker:
         if not text or len(text.strip()) == 0:
             return []
 
+        # Split into words once; validation and chunking share the result
+        words = text.split()
+
         # Comprehensive content validation pipeline
-        validation_result = self._validate_filing_content(text, base_metadata)
+        validation_result = self._validate_filing_content(text, base_metadata, len(words))
         
         if not validation_result['is_valid']:
             print(f"Skipping invalid content: {validation_result['reason']} - {base_metadata.get('source_file', 'unknown')}")
             return []
 
-        # Split into words for more precise chunking
-        words = text.split()
-
         # Additional quality check after word splitting
         if len(words) < 100:
             print(f"Skipping short document ({len(words)} words): {base_metadata.get('source_file', 'unknown')}")
             return []
 
-        chunks = []
+        # Attribution fields shared by every chunk of this file
+        attribution_template = self._create_source_attribution_template(base_metadata)
+
+        # Collect the chunk windows first so metadata can be enriched as a batch
+        windows = []
         start_idx = 0
-        chunk_counter = 0
+        chunk_size = self.chunk_size
+        overlap = self.overlap
+        total_words = len(words)
 
-        while start_idx < len(words):
+        while start_idx < total_words:
             # Calculate end index for this chunk
-            end_idx = min(start_idx + self.chunk_size, len(words))
+            end_idx = min(start_idx + chunk_size, total_words)
 
             # Extract chunk text
             chunk_words = words[start_idx:end_idx]
@@ -139,13 +329,46 @@ class DocumentChunker:
             if len(chunk_text.strip()) < 50:
                 break
             
+            windows.append((chunk_text, start_idx, end_idx, len(chunk_words)))
+            
+            # Move start position with overlap
+            next_start = end_idx - overlap
+
+            # Prevent infinite loop - ensure we always make progress
+            if next_start <= start_idx:
+                next_start = start_idx + max(1, chunk_size // 2)
+
+            start_idx = next_start
+
+            # Additional safety check
+            if start_idx >= total_words:
+                break
+        
+        # One identifier call per file for content types and metrics
+        chunk_texts = [window[0] for window in windows]
+        content_types_batch = self.financial_identifier.identify_batch(chunk_texts)
+        metrics_batch = self.financial_identifier.extract_batch(chunk_texts)
+        
+        # Chunk IDs differ only by their index within the file
+        chunk_id_prefix = self._generate_chunk_id_prefix(base_metadata)
+        
+        # Bound once rather than looked up on every chunk
+        enrich_chunk_metadata = self._enrich_chunk_metadata
+        
+        chunks = []
+        
+        for chunk_counter, (window, content_types, financial_metrics) in enumerate(
+                zip(windows, content_types_batch, metrics_batch)):
+            chunk_text, start_idx, end_idx, word_count = window
+            
             # Enhanced metadata extraction and enrichment
-            enhanced_metadata = self._enrich_chunk_metadata(
-                chunk_text, base_metadata, chunk_counter, start_idx, end_idx, len(chunk_words)
+            enhanced_metadata = enrich_chunk_metadata(
+                chunk_text, base_metadata, chunk_counter, start_idx, end_idx, word_count,
+                attribution_template, content_types, financial_metrics
             )
             
             # Generate unique chunk ID
-            chunk_id = self._generate_chunk_id(base_metadata, chunk_counter)
+            chunk_id = f"{chunk_id_prefix}{chunk_counter:04d}"
             
             # Create chunk object
             chunk = DocumentChunk(
@@ -157,85 +380,137 @@ class DocumentChunker:
             )
             
             chunks.append(chunk)
-            chunk_counter += 1
-            
-            # Move start position with overlap
-            next_start = end_idx - self.overlap
-
-            # Prevent infinite loop - ensure we always make progress
-            if next_start <= start_idx:
-                next_start = start_idx + max(1, self.chunk_size // 2)
-
-            start_idx = next_start
-
-            # Additional safety check
-            if start_idx >= len(words):
-                break
         
         return chunks
     
-    def _generate_chunk_id(self, metadata: Dict, chunk_index: int) -> str:
-        """Generate unique chunk identifier."""
+    def _generate_chunk_id_prefix(self, metadata: Dict) -> str:
+        """Generate the per-file prefix of the unique chunk identifiers."""
         
         ticker = metadata.get('ticker', 'UNK')
         filing_type = metadata.get('filing_type', 'UNK')
         filing_date = metadata.get('filing_date', 'UNK')
         
-        return f"{ticker}_{filing_type}_{filing_date}_{chunk_index:04d}"
+        return f"{ticker}_{filing_type}_{filing_date}_"
+    
+    def chunk_multiple_files(self, filepaths: List[str], 
+                             max_workers: Optional[int] = None) -> List[DocumentChunk]:
+        """Process and chunk multiple SEC filings across worker processes."""
+
+        return list(self.iter_chunks(filepaths, max_workers))
     
-    def chunk_multiple_files(self, filepaths: List[str]) -> List[DocumentChunk]:
-        """Process and chunk multiple SEC filings."""
+    def iter_chunks(self, filepaths: List[str], 
+                    max_workers: Optional[int] = None) -> Iterator[DocumentChunk]:
+        """Yield chunks file by file, in input order, without holding the whole corpus."""
 
-        all_chunks = []
+        if max_workers is None:
+            # Pool start-up outweighs the parallel gain on a handful of files
+            max_workers = MAX_CHUNKING_WORKERS if len(filepaths) >= _MIN_PARALLEL_FILES else 1
+        workers = min(max_workers, len(filepaths))
+        completed = 0
         processed_count = 0
         skipped_count = 0
         error_count = 0
+        total_chunks = 0
 
-        print(f"Processing {len(filepaths)} files...")
+        print(f"Processing {len(filepaths)} files with {max(workers, 1)} worker(s)...")
 
-        for i, filepath in enumerate(filepaths):
-            try:
+        file_results = self._iter_chunked_files(filepaths, workers)
+        try:
+            for file_chunks in file_results:
                 # Progress indicator
-                if i % 50 == 0:
-                    print(f"Progress: {i}/{len(filepaths)} files processed")
+                if completed % 50 == 0:
+                    print(f"Progress: {completed}/{len(filepaths)} files processed")
+                completed += 1
 
-                file_chunks = self.chunk_file(filepath)
-                if file_chunks:
-                    all_chunks.extend(file_chunks)
+                if file_chunks is None:
+                    error_count += 1
+                elif file_chunks:
                     processed_count += 1
+                    total_chunks += len(file_chunks)
+                    yield from file_chunks
                 else:
                     skipped_count += 1
 
-            except KeyboardInterrupt:
-                print(f"\nProcessing interrupted by user at file {i}/{len(filepaths)}")
-                break
-            except Exception as e:
-                print(f"Error processing {filepath}: {e}")
-                error_count += 1
-                continue
+        except KeyboardInterrupt:
+            print(f"\nProcessing interrupted by user at file {completed}/{len(filepaths)}")
+        finally:
+            file_results.close()
 
         print(f"\nProcessing complete:")
         print(f"  - Successfully processed: {processed_count} files")
         print(f"  - Skipped (index pages/short): {skipped_count} files")
         print(f"  - Errors: {error_count} files")
-        print(f"  - Total chunks created: {len(all_chunks)}")
-
-        return all_chunks
+        print(f"  - Total chunks created: {total_chunks}")
     
-    def get_chunks_by_ticker(self, chunks: List[DocumentChunk], ticker: str) -> List[DocumentChunk]:
+    def _iter_chunked_files(self, filepaths: List[str], workers: int) -> Iterator[Optional[List[DocumentChunk]]]:
+        """Yield each file's chunks in input order; None marks a file that failed."""
+        
+        if workers <= 1:
+            for filepath in filepaths:
+                try:
+                    file_chunks = self.chunk_file(filepath)
+                except Exception as e:
+                    print(f"Error processing {filepath}: {e}")
+                    file_chunks = None
+                yield file_chunks
+            return
+        
+        # Parsing and chunking are CPU-bound, so each file goes to its own process
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_chunk_worker,
+            initargs=(self.chunk_size, self.overlap)
+        )
+        remaining = iter(filepaths)
+        pending = deque()
+        try:
+            # Keep a bounded number of files in flight so finished results never pile up
+            for filepath in islice(remaining, workers * 2):
+                pending.append((filepath, executor.submit(_chunk_file_in_worker, filepath)))
+            
+            while pending:
+                filepath, future = pending.popleft()
+                try:
+                    file_chunks = future.result()
+                except Exception as e:
+                    print(f"Error processing {filepath}: {e}")
+                    file_chunks = None
+                
+                next_filepath = next(remaining, None)
+                if next_filepath is not None:
+                    pending.append((next_filepath, executor.submit(_chunk_file_in_worker, next_filepath)))
+                
+                yield file_chunks
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+    
+    def get_chunks_by_ticker(self, chunks: Union[List[DocumentChunk], ChunkTable], 
+                             ticker: str) -> List[DocumentChunk]:
         """Filter chunks by company ticker."""
         
+        if isinstance(chunks, ChunkTable):
+            return chunks.take(chunks.ticker_rows.get(ticker, _NO_ROWS))
+        
         return [chunk for chunk in chunks if chunk.metadata.get('ticker') == ticker]
     
-    def get_chunks_by_filing_type(self, chunks: List[DocumentChunk], filing_type: str) -> List[DocumentChunk]:
+    def get_chunks_by_filing_type(self, chunks: Union[List[DocumentChunk], ChunkTable], 
+                                  filing_type: str) -> List[DocumentChunk]:
         """Filter chunks by filing type."""
         
+        if isinstance(chunks, ChunkTable):
+            return chunks.take(chunks.filing_type_rows.get(filing_type, _NO_ROWS))
+        
         return [chunk for chunk in chunks if chunk.metadata.get('filing_type') == filing_type]
     
-    def get_chunks_by_date_range(self, chunks: List[DocumentChunk], 
+    def get_chunks_by_date_range(self, chunks: Union[List[DocumentChunk], ChunkTable], 
                                 start_date: str, end_date: str) -> List[DocumentChunk]:
         """Filter chunks by filing date range."""
         
+        if isinstance(chunks, ChunkTable):
+            return chunks.take(chunks.date_range_rows(start_date, end_date))
+        
         filtered_chunks = []
         
         for chunk in chunks:
@@ -245,31 +520,62 @@ class DocumentChunker:
         
         return filtered_chunks
     
-    def get_chunk_statistics(self, chunks: List[DocumentChunk]) -> Dict:
+    def filter_chunks(self, chunks: Union[List[DocumentChunk], ChunkTable], 
+                      ticker: Optional[str] = None, filing_type: Optional[str] = None,
+                      start_date: Optional[str] = None, 
+                      end_date: Optional[str] = None) -> List[DocumentChunk]:
+        """Filter chunks on any combination of ticker, filing type and date range in one pass."""
+        
+        if isinstance(chunks, ChunkTable):
+            mask = np.ones(len(chunks), dtype=bool)
+            if ticker is not None:
+                mask &= chunks.tickers == ticker
+            if filing_type is not None:
+                mask &= chunks.filing_types == filing_type
+            if start_date is not None:
+                mask &= chunks.filing_dates >= start_date
+            if end_date is not None:
+                mask &= chunks.filing_dates <= end_date
+            return chunks.select(mask)
+        
+        filtered_chunks = []
+        
+        for chunk in chunks:
+            metadata = chunk.metadata
+            if ticker is not None and metadata.get('ticker') != ticker:
+                continue
+            if filing_type is not None and metadata.get('filing_type') != filing_type:
+                continue
+            if start_date is not None or end_date is not None:
+                filing_date = metadata.get('filing_date', '')
+                if start_date is not None and filing_date < start_date:
+                    continue
+                if end_date is not None and filing_date > end_date:
+                    continue
+            filtered_chunks.append(chunk)
+        
+        return filtered_chunks
+    
+    def get_chunk_statistics(self, chunks: Union[List[DocumentChunk], ChunkTable]) -> Dict:
         """Generate statistics about the chunks."""
         
-        if not chunks:
+        if not len(chunks):
             return {"total_chunks": 0}
         
-        # Basic stats
         total_chunks = len(chunks)
-        total_words = sum(chunk.metadata.get('chunk_word_count', 0) for chunk in chunks)
         
-        # Group by ticker
-        ticker_stats = {}
-        for chunk in chunks:
-            ticker = chunk.metadata.get('ticker', 'Unknown')
-            if ticker not in ticker_stats:
-                ticker_stats[ticker] = 0
-            ticker_stats[ticker] += 1
+        if isinstance(chunks, ChunkTable):
+            # The columns store missing and empty values alike as '', so the
+            # per-value counts come from the metadata as in the list path
+            metadata = [chunk.metadata for chunk in chunks.chunks]
+            total_words = int(chunks.word_counts.sum())
+        else:
+            metadata = [chunk.metadata for chunk in chunks]
+            total_words = sum([m.get('chunk_word_count', 0) for m in metadata])
         
-        # Group by filing type
-        filing_type_stats = {}
-        for chunk in chunks:
-            filing_type = chunk.metadata.get('filing_type', 'Unknown')
-            if filing_type not in filing_type_stats:
-                filing_type_stats[filing_type] = 0
-            filing_type_stats[filing_type] += 1
+        # Counter counts a prebuilt list in C, cheaper than a per-chunk dict update
+        ticker_stats = dict(Counter([m.get('ticker', 'Unknown') for m in metadata]))
+        filing_type_stats = dict(Counter([m.get('filing_type', 'Unknown') for m in metadata]))
         
         return {
             "total_chunks": total_chunks,
@@ -281,30 +587,15 @@ class DocumentChunker:
             "unique_filing_types": len(filing_type_stats)
         }
     
-    def _validate_filing_content(self, text: str, metadata: Dict) -> Dict:
+    def _validate_filing_content(self, text: str, metadata: Dict, 
+                                 word_count: Optional[int] = None) -> Dict:
         """Comprehensive content validation pipeline for SEC filings."""
         
-        text_lower = text.lower()
-        word_count = len(text.split())
+        if word_count is None:
+            word_count = len(text.split())
         filing_type = metadata.get('filing_type', '')
         
-        # Check 1: XBRL viewer page detection
-        xbrl_indicators = [
-            'xbrl viewer', 'ixviewer', 'loadviewer', 'javascript',
-            'iframe', 'this page uses javascript', 'edgar-logo',
-            'filing detail', 'edgar filing documents'
-        ]
-        
-        xbrl_count = sum(1 for indicator in xbrl_indicators if indicator in text_lower)
-        
-        if xbrl_count >= 3 and word_count < 1000:
-            return {
-                'is_valid': False,
-                'reason': 'XBRL viewer page detected',
-                'quality_score': 0.0
-            }
-        
-        # Check 2: Minimum content length
+        # Check 1: Minimum content length, before any lowercasing or scanning
         if word_count < 100:
             return {
                 'is_valid': False,
@@ -312,6 +603,21 @@ class DocumentChunker:
                 'quality_score': 0.1
             }
         
+        # The indicators are ASCII, so scan lowercased UTF-8 bytes; this stays
+        # fast even when the text holds non-Latin-1 characters such as curly quotes
+        text_lower = text.encode('utf-8', 'ignore').lower()
+        
+        # Check 2: XBRL viewer page detection (only short pages can qualify)
+        if word_count < 1000:
+            xbrl_count = sum(1 for indicator in _XBRL_INDICATORS if indicator in text_lower)
+            
+            if xbrl_count >= 3:
+                return {
+                    'is_valid': False,
+                    'reason': 'XBRL viewer page detected',
+                    'quality_score': 0.0
+                }
+        
         # Check 3: Filing-specific content validation
         filing_content_score = self._calculate_filing_content_score(text_lower, filing_type)
         
@@ -336,33 +642,10 @@ class DocumentChunker:
             'financial_content_score': financial_score
         }
     
-    def _calculate_filing_content_score(self, text_lower: str, filing_type: str) -> float:
+    def _calculate_filing_content_score(self, text_lower: bytes, filing_type: str) -> float:
         """Calculate score based on filing-specific content indicators."""
         
-        filing_indicators = {
-            '10-K': [
-                'annual report', 'business overview', 'risk factors', 
-                'management discussion', 'financial statements', 'consolidated statements',
-                'item 1', 'item 2', 'item 3', 'part i', 'part ii'
-            ],
-            '10-Q': [
-                'quarterly report', 'financial statements', 'condensed consolidated',
-                'management discussion', 'item 1', 'item 2', 'part i', 'part ii'
-            ],
-            '8-K': [
-                'current report', 'item 1', 'item 2', 'item 3', 'item 4',
-                'item 5', 'item 7', 'item 8', 'item 9', 'signature'
-            ],
-            'DEF 14A': [
-                'proxy statement', 'annual meeting', 'executive compensation',
-                'board of directors', 'shareholder', 'voting', 'proposal'
-            ],
-            '3': ['initial statement', 'beneficial ownership', 'securities owned'],
-            '4': ['statement of changes', 'securities acquired', 'securities disposed'],
-            '5': ['annual statement', 'securities beneficially owned']
-        }
-        
-        expected_indicators = filing_indicators.get(filing_type, ['sec filing', 'securities', 'company'])
+        expected_indicators = _FILING_INDICATORS.get(filing_type, _DEFAULT_FILING_INDICATORS)
         
         # Count how many indicators are present
         found_indicators = sum(1 for indicator in expected_indicators if indicator in text_lower)
@@ -375,39 +658,36 @@ class DocumentChunker:
         
         return score
     
-    def _calculate_financial_content_score(self, text_lower: str) -> float:
+    def _calculate_financial_content_score(self, text_lower: bytes) -> float:
         """Calculate score based on financial content indicators."""
         
-        financial_terms = [
-            'revenue', 'income', 'profit', 'loss', 'earnings', 'cash flow',
-            'assets', 'liabilities', 'equity', 'debt', 'investment',
-            'financial', 'fiscal', 'quarter', 'annual', 'million', 'billion',
-            'percent', 'percentage', 'growth', 'decline', 'increase', 'decrease'
-        ]
-        
         # Count financial terms (with some weighting for importance)
         financial_count = 0
-        for term in financial_terms:
+        for term in _FINANCIAL_TERMS:
             if term in text_lower:
                 # Weight more important terms higher
-                if term in ['revenue', 'income', 'profit', 'earnings', 'cash flow']:
+                if term in _WEIGHTED_FINANCIAL_TERMS:
                     financial_count += 2
                 else:
                     financial_count += 1
         
         # Normalize score (0.0 to 1.0)
-        max_possible_score = len(financial_terms) * 1.5  # Account for weighted terms
+        max_possible_score = len(_FINANCIAL_TERMS) * 1.5  # Account for weighted terms
         score = min(financial_count / max_possible_score, 1.0)
         
         return score
     
     def _enrich_chunk_metadata(self, chunk_text: str, base_metadata: Dict, 
                               chunk_index: int, start_idx: int, end_idx: int, 
-                              word_count: int) -> Dict:
+                              word_count: int, attribution_template: Dict,
+                              content_types: List[str], financial_metrics: Dict) -> Dict:
         """Enhanced metadata extraction and enrichment for document chunks."""
         
         filing_type = base_metadata.get('filing_type', '')
         
+        # Lowercase once for every substring check on this chunk
+        chunk_text_lower = chunk_text.lower()
+        
         # Start with base chunk metadata
         enriched_metadata = {
             **base_metadata,
@@ -417,8 +697,7 @@ class DocumentChunker:
             "chunk_word_count": word_count
         }
         
-        # Financial content type identification
-        content_types = self.financial_identifier.identify_financial_content_type(chunk_text)
+        # Financial content types, identified for the whole file in _create_chunks
         enriched_metadata["financial_content_types"] = content_types
         
         # Primary content type (most likely type)
@@ -427,8 +706,7 @@ class DocumentChunker:
         else:
             enriched_metadata["primary_content_type"] = "general"
         
-        # Financial metrics extraction
-        financial_metrics = self.financial_identifier.extract_financial_metrics(chunk_text)
+        # Financial metrics, extracted for the whole file in _create_chunks
         enriched_metadata["financial_metrics"] = financial_metrics
         
         # Count total financial metrics found
@@ -437,7 +715,7 @@ class DocumentChunker:
         
         # Content quality scoring
         quality_score = self.financial_identifier.calculate_content_quality_score(
-            chunk_text, filing_type
+            chunk_text, filing_type, content_types, financial_metrics, word_count
         )
         enriched_metadata["content_quality_score"] = quality_score
         
@@ -450,11 +728,13 @@ class DocumentChunker:
         enriched_metadata["financial_concepts"] = financial_concepts
         
         # Create comprehensive source attribution
-        source_attribution = self._create_source_attribution(base_metadata, chunk_index)
+        source_attribution = self._create_source_attribution(
+            attribution_template, base_metadata, chunk_index
+        )
         enriched_metadata["source_attribution"] = source_attribution
         
         # Add searchable keywords for better retrieval
-        keywords = self._extract_keywords(chunk_text, content_types)
+        keywords = self._extract_keywords(chunk_text_lower, content_types)
         enriched_metadata["keywords"] = keywords
         
         return enriched_metadata
@@ -490,32 +770,15 @@ class DocumentChunker:
         """Extract key financial concepts from text."""
         
         concepts = []
-        text_lower = text.lower()
-        
-        # Financial concept patterns
-        concept_patterns = {
-            "revenue_growth": [r"revenue.*growth", r"sales.*growth", r"top.*line.*growth"],
-            "profitability": [r"profit.*margin", r"operating.*margin", r"net.*income"],
-            "liquidity": [r"cash.*flow", r"working.*capital", r"liquidity"],
-            "debt": [r"debt.*ratio", r"leverage", r"borrowing"],
-            "market_share": [r"market.*share", r"competitive.*position"],
-            "innovation": [r"research.*development", r"r&d", r"innovation"],
-            "risk_management": [r"risk.*management", r"hedging", r"insurance"],
-            "acquisitions": [r"acquisition", r"merger", r"m&a"],
-            "dividends": [r"dividend", r"share.*repurchase", r"buyback"],
-            "guidance": [r"guidance", r"outlook", r"forecast"]
-        }
         
-        for concept, patterns in concept_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    concepts.append(concept)
-                    break
+        for concept, patterns in _CONCEPT_PATTERNS.items():
+            if any(pattern.search(text) for pattern in patterns):
+                concepts.append(concept)
         
         return concepts
     
-    def _create_source_attribution(self, base_metadata: Dict, chunk_index: int) -> Dict:
-        """Create comprehensive source attribution for the chunk."""
+    def _create_source_attribution_template(self, base_metadata: Dict) -> Dict:
+        """Build the per-file part of the source attribution once."""
         
         return {
             "company_ticker": base_metadata.get('ticker', 'Unknown'),
@@ -523,35 +786,24 @@ class DocumentChunker:
             "filing_type": base_metadata.get('filing_type', 'Unknown'),
             "filing_date": base_metadata.get('filing_date', 'Unknown'),
             "source_file": base_metadata.get('source_file', 'Unknown'),
-            "chunk_position": chunk_index,
-            "citation_text": self._generate_citation_text(base_metadata, chunk_index),
             "document_url": self._generate_document_url(base_metadata),
             "extraction_timestamp": self._get_current_timestamp()
         }
     
-    def _get_company_name(self, ticker: str) -> str:
-        """Get company name from ticker (simplified mapping)."""
+    def _create_source_attribution(self, attribution_template: Dict, 
+                                   base_metadata: Dict, chunk_index: int) -> Dict:
+        """Create comprehensive source attribution for the chunk."""
         
-        company_names = {
-            "AAPL": "Apple Inc.",
-            "MSFT": "Microsoft Corporation", 
-            "GOOGL": "Alphabet Inc.",
-            "AMZN": "Amazon.com Inc.",
-            "TSLA": "Tesla Inc.",
-            "JPM": "JPMorgan Chase & Co.",
-            "BAC": "Bank of America Corporation",
-            "WFC": "Wells Fargo & Company",
-            "JNJ": "Johnson & Johnson",
-            "PFE": "Pfizer Inc.",
-            "XOM": "Exxon Mobil Corporation",
-            "CVX": "Chevron Corporation",
-            "WMT": "Walmart Inc.",
-            "GE": "General Electric Company",
-            "CAT": "Caterpillar Inc.",
-            "BA": "The Boeing Company"
+        return {
+            **attribution_template,
+            "chunk_position": chunk_index,
+            "citation_text": self._generate_citation_text(base_metadata, chunk_index)
         }
+    
+    def _get_company_name(self, ticker: str) -> str:
+        """Get company name from ticker (simplified mapping)."""
         
-        return company_names.get(ticker, f"{ticker} Inc.")
+        return _COMPANY_NAMES.get(ticker, f"{ticker} Inc.")
     
     def _generate_citation_text(self, base_metadata: Dict, chunk_index: int) -> str:
         """Generate citation text for the chunk."""
@@ -585,36 +837,26 @@ class DocumentChunker:
         from datetime import datetime
         return datetime.now().isoformat()
     
-    def _extract_keywords(self, text: str, content_types: List[str]) -> List[str]:
-        """Extract searchable keywords from chunk text."""
-        
-        keywords = []
-        text_lower = text.lower()
-        
-        # Add content types as keywords
-        keywords.extend(content_types)
-        
-        # Financial keywords
-        financial_keywords = [
-            "revenue", "income", "profit", "loss", "earnings", "cash flow",
-            "assets", "liabilities", "equity", "debt", "investment", "growth",
-            "margin", "ratio", "performance", "results", "operations"
-        ]
-        
-        for keyword in financial_keywords:
-            if keyword in text_lower:
-                keywords.append(keyword)
-        
-        # Business keywords
-        business_keywords = [
-            "strategy", "market", "competition", "customer", "product", "service",
-            "technology", "innovation", "acquisition", "merger", "expansion",
-            "risk", "opportunity", "challenge", "outlook", "guidance"
-        ]
-        
-        for keyword in business_keywords:
-            if keyword in text_lower:
-                keywords.append(keyword)
-        
-        # Remove duplicates and return
-        return list(set(keywords))
\ No newline at end of file
+    def _extract_keywords(self, text_lower: str, content_types: List[str]) -> List[str]:
+        """Extract searchable keywords from lowercased chunk text."""
+        
+        # Content types plus financial and business keywords, deduplicated as we go
+        keywords = set(content_types)
+        keywords.update(keyword for keyword in _KEYWORDS if keyword in text_lower)
+        
+        return list(keywords)
+
+
+# Per-process chunker for chunk_multiple_files workers
+_worker_chunker = None
+
+
+def _init_chunk_worker(chunk_size: int, overlap: int):
+    """Build the chunker once per worker process."""
+    global _worker_chunker
+    _worker_chunker = DocumentChunker(chunk_size=chunk_size, overlap=overlap)
+
+
+def _chunk_file_in_worker(filepath: str) -> List[DocumentChunk]:
+    """Chunk one file inside a worker process."""
+    return _worker_chunker.chunk_file(filepath)
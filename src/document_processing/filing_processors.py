@@ -3,9 +3,27 @@ Filing-specific document processors for different SEC filing types
 """
 
 import re
+from functools import lru_cache, partial
 from typing import Dict, List, Optional
 from bs4 import BeautifulSoup
 
+# lxml's C parser is much faster than html.parser on multi-megabyte filings
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# lxml rejects str input that carries an encoding declaration (inline XBRL filings do)
+_XML_DECLARATION_RE = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+def _compile_patterns(patterns: Dict[str, List[str]], flags: int = re.IGNORECASE) -> Dict[str, List[re.Pattern]]:
+    """Compile every pattern of a {name: [pattern, ...]} table once"""
+    return {
+        name: [re.compile(pattern, flags) for pattern in pattern_list]
+        for name, pattern_list in patterns.items()
+    }
+
 
 class FilingProcessor:
     """Base class for filing-specific processors"""
@@ -19,105 +37,139 @@ class FilingProcessor:
     
     def clean_html(self, html_content: str) -> str:
         """Clean HTML content and extract text"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        text = self._html_to_text(html_content)
         
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Get text and clean up whitespace
-        text = soup.get_text()
+        # Clean up whitespace
         lines = (line.strip() for line in text.splitlines())
         chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
         text = ' '.join(chunk for chunk in chunks if chunk)
         
         return text
     
-    def identify_key_sections(self, text: str) -> Dict[str, str]:
-        """Identify key sections in the filing"""
-        return {"content": text}
-
-
-class TenKProcessor(FilingProcessor):
-    """Processor for 10-K annual reports"""
-    
-    def __init__(self):
-        super().__init__()
-        self.filing_type = "10-K"
-    
-    def extract_sections(self, html_content: str) -> Dict[str, str]:
-        """Extract 10-K specific sections"""
+    def _html_to_text(self, html_content: str) -> str:
+        """Return the text of an HTML document without script and style contents"""
+        if lxml is not None and html_content.strip():
+            try:
+                root = lxml.html.fromstring(_XML_DECLARATION_RE.sub('', html_content, count=1))
+                for element in list(root.iter('script', 'style')):
+                    element.drop_tree()
+                return root.text_content()
+            except (ValueError, lxml.etree.ParserError):
+                pass
         
-        text = self.clean_html(html_content)
-        sections = {}
-        
-        # 10-K section patterns
-        section_patterns = {
-            "business_overview": [
-                r"item\s+1\s*[\.\-\s]*business",
-                r"business\s+overview",
-                r"our\s+business"
-            ],
-            "risk_factors": [
-                r"item\s+1a\s*[\.\-\s]*risk\s+factors",
-                r"risk\s+factors",
-                r"principal\s+risks"
-            ],
-            "management_discussion": [
-                r"item\s+7\s*[\.\-\s]*management['\s]*s\s+discussion",
-                r"management['\s]*s\s+discussion\s+and\s+analysis",
-                r"md&a"
-            ],
-            "financial_statements": [
-                r"item\s+8\s*[\.\-\s]*financial\s+statements",
-                r"consolidated\s+statements",
-                r"financial\s+statements"
-            ]
-        }
+        soup = BeautifulSoup(html_content, 'html.parser')
         
-        sections = self._extract_sections_by_patterns(text, section_patterns)
-        sections["full_text"] = text
+        # Remove script and style elements
+        for script in soup(["script", "style"]):
+            script.decompose()
         
-        return sections
+        return soup.get_text()
     
-    def _extract_sections_by_patterns(self, text: str, patterns: Dict[str, List[str]]) -> Dict[str, str]:
+    def _extract_sections_by_patterns(self, text: str, patterns: Dict[str, List[re.Pattern]]) -> Dict[str, str]:
         """Extract sections using regex patterns"""
         
         sections = {}
-        text_lower = text.lower()
         
-        # First, find all section boundaries
+        # First, find all section boundaries; the patterns are case-insensitive,
+        # so match offsets line up with the original text
         all_matches = []
         for section_name, pattern_list in patterns.items():
             for pattern in pattern_list:
-                matches = list(re.finditer(pattern, text_lower, re.IGNORECASE))
-                for match in matches:
-                    all_matches.append((match.start(), section_name, pattern))
+                for match in pattern.finditer(text):
+                    all_matches.append((match.start(), section_name, pattern.pattern))
         
         # Sort matches by position
         all_matches.sort(key=lambda x: x[0])
         
+        # Each section runs to the next boundary, the last one to the end of the document
+        end_positions = [match[0] for match in all_matches[1:]]
+        end_positions.append(len(text))
+        
         # Extract sections between boundaries
-        for i, (start_pos, section_name, pattern) in enumerate(all_matches):
-            # Find the end position (next section or end of document)
-            if i + 1 < len(all_matches):
-                end_pos = all_matches[i + 1][0]
-            else:
-                end_pos = len(text)
+        for (start_pos, section_name, pattern), end_pos in zip(all_matches, end_positions):
+            # Keep the first substantial occurrence; skip slicing once a section is found
+            if section_name in sections:
+                continue
             
             # Extract section text
             section_text = text[start_pos:end_pos].strip()
             
-            # Only include substantial sections and avoid duplicates
-            if len(section_text) > 100 and section_name not in sections:
+            # Only include substantial sections
+            if len(section_text) > 100:
                 sections[section_name] = section_text
         
         return sections
+    
+    def identify_key_sections(self, text: str) -> Dict[str, str]:
+        """Identify key sections in the filing"""
+        return {"content": text}
+
+
+class TenKProcessor(FilingProcessor):
+    """Processor for 10-K annual reports"""
+    
+    # 10-K section patterns, compiled once per class
+    SECTION_PATTERNS = _compile_patterns({
+        "business_overview": [
+            r"item\s+1\s*[\.\-\s]*business",
+            r"business\s+overview",
+            r"our\s+business"
+        ],
+        "risk_factors": [
+            r"item\s+1a\s*[\.\-\s]*risk\s+factors",
+            r"risk\s+factors",
+            r"principal\s+risks"
+        ],
+        "management_discussion": [
+            r"item\s+7\s*[\.\-\s]*management['\s]*s\s+discussion",
+            r"management['\s]*s\s+discussion\s+and\s+analysis",
+            r"md&a"
+        ],
+        "financial_statements": [
+            r"item\s+8\s*[\.\-\s]*financial\s+statements",
+            r"consolidated\s+statements",
+            r"financial\s+statements"
+        ]
+    })
+    
+    def __init__(self):
+        super().__init__()
+        self.filing_type = "10-K"
+    
+    def extract_sections(self, html_content: str) -> Dict[str, str]:
+        """Extract 10-K specific sections"""
+        
+        text = self.clean_html(html_content)
+        sections = {}
+        
+        sections = self._extract_sections_by_patterns(text, self.SECTION_PATTERNS)
+        sections["full_text"] = text
+        
+        return sections
 
 
 class TenQProcessor(FilingProcessor):
     """Processor for 10-Q quarterly reports"""
     
+    # 10-Q section patterns, compiled once per class
+    SECTION_PATTERNS = _compile_patterns({
+        "financial_statements": [
+            r"item\s+1\s*[\.\-\s]*financial\s+statements",
+            r"condensed\s+consolidated\s+statements",
+            r"unaudited\s+financial\s+statements"
+        ],
+        "management_discussion": [
+            r"item\s+2\s*[\.\-\s]*management['\s]*s\s+discussion",
+            r"management['\s]*s\s+discussion\s+and\s+analysis",
+            r"md&a"
+        ],
+        "controls_procedures": [
+            r"item\s+4\s*[\.\-\s]*controls\s+and\s+procedures",
+            r"disclosure\s+controls",
+            r"internal\s+control"
+        ]
+    })
+    
     def __init__(self):
         super().__init__()
         self.filing_type = "10-Q"
@@ -128,38 +180,33 @@ class TenQProcessor(FilingProcessor):
         text = self.clean_html(html_content)
         sections = {}
         
-        # 10-Q section patterns
-        section_patterns = {
-            "financial_statements": [
-                r"item\s+1\s*[\.\-\s]*financial\s+statements",
-                r"condensed\s+consolidated\s+statements",
-                r"unaudited\s+financial\s+statements"
-            ],
-            "management_discussion": [
-                r"item\s+2\s*[\.\-\s]*management['\s]*s\s+discussion",
-                r"management['\s]*s\s+discussion\s+and\s+analysis",
-                r"md&a"
-            ],
-            "controls_procedures": [
-                r"item\s+4\s*[\.\-\s]*controls\s+and\s+procedures",
-                r"disclosure\s+controls",
-                r"internal\s+control"
-            ]
-        }
-        
-        sections = self._extract_sections_by_patterns(text, section_patterns)
+        sections = self._extract_sections_by_patterns(text, self.SECTION_PATTERNS)
         sections["full_text"] = text
         
         return sections
-    
-    def _extract_sections_by_patterns(self, text: str, patterns: Dict[str, List[str]]) -> Dict[str, str]:
-        """Extract sections using regex patterns"""
-        return TenKProcessor()._extract_sections_by_patterns(text, patterns)
 
 
 class EightKProcessor(FilingProcessor):
     """Processor for 8-K current reports"""
     
+    # 8-K item patterns, compiled once per class
+    SECTION_PATTERNS = _compile_patterns({
+        "material_events": [
+            r"item\s+[1-9]\s*[\.\-\s]*",
+            r"material\s+events",
+            r"corporate\s+changes"
+        ],
+        "financial_statements": [
+            r"item\s+9\.01\s*[\.\-\s]*financial\s+statements",
+            r"pro\s+forma\s+financial"
+        ],
+        "exhibits": [
+            r"item\s+9\.01\s*[\.\-\s]*exhibits",
+            r"signature",
+            r"exhibit\s+index"
+        ]
+    })
+    
     def __init__(self):
         super().__init__()
         self.filing_type = "8-K"
@@ -170,37 +217,42 @@ class EightKProcessor(FilingProcessor):
         text = self.clean_html(html_content)
         sections = {}
         
-        # 8-K item patterns
-        item_patterns = {
-            "material_events": [
-                r"item\s+[1-9]\s*[\.\-\s]*",
-                r"material\s+events",
-                r"corporate\s+changes"
-            ],
-            "financial_statements": [
-                r"item\s+9\.01\s*[\.\-\s]*financial\s+statements",
-                r"pro\s+forma\s+financial"
-            ],
-            "exhibits": [
-                r"item\s+9\.01\s*[\.\-\s]*exhibits",
-                r"signature",
-                r"exhibit\s+index"
-            ]
-        }
-        
-        sections = self._extract_sections_by_patterns(text, item_patterns)
+        sections = self._extract_sections_by_patterns(text, self.SECTION_PATTERNS)
         sections["full_text"] = text
         
         return sections
-    
-    def _extract_sections_by_patterns(self, text: str, patterns: Dict[str, List[str]]) -> Dict[str, str]:
-        """Extract sections using regex patterns"""
-        return TenKProcessor()._extract_sections_by_patterns(text, patterns)
 
 
 class ProxyProcessor(FilingProcessor):
     """Processor for DEF 14A proxy statements"""
     
+    # Proxy statement section patterns, compiled once per class
+    SECTION_PATTERNS = _compile_patterns({
+        "executive_compensation": [
+            r"executive\s+compensation",
+            r"compensation\s+discussion",
+            r"summary\s+compensation\s+table",
+            r"pay\s+ratio"
+        ],
+        "board_governance": [
+            r"board\s+of\s+directors",
+            r"corporate\s+governance",
+            r"director\s+compensation",
+            r"board\s+committees"
+        ],
+        "shareholder_matters": [
+            r"shareholder\s+proposals",
+            r"voting\s+matters",
+            r"proposals\s+to\s+be\s+voted",
+            r"annual\s+meeting"
+        ],
+        "audit_matters": [
+            r"audit\s+committee",
+            r"auditor\s+fees",
+            r"independent\s+auditor"
+        ]
+    })
+    
     def __init__(self):
         super().__init__()
         self.filing_type = "DEF 14A"
@@ -211,46 +263,35 @@ class ProxyProcessor(FilingProcessor):
         text = self.clean_html(html_content)
         sections = {}
         
-        # Proxy statement section patterns
-        section_patterns = {
-            "executive_compensation": [
-                r"executive\s+compensation",
-                r"compensation\s+discussion",
-                r"summary\s+compensation\s+table",
-                r"pay\s+ratio"
-            ],
-            "board_governance": [
-                r"board\s+of\s+directors",
-                r"corporate\s+governance",
-                r"director\s+compensation",
-                r"board\s+committees"
-            ],
-            "shareholder_matters": [
-                r"shareholder\s+proposals",
-                r"voting\s+matters",
-                r"proposals\s+to\s+be\s+voted",
-                r"annual\s+meeting"
-            ],
-            "audit_matters": [
-                r"audit\s+committee",
-                r"auditor\s+fees",
-                r"independent\s+auditor"
-            ]
-        }
-        
-        sections = self._extract_sections_by_patterns(text, section_patterns)
+        sections = self._extract_sections_by_patterns(text, self.SECTION_PATTERNS)
         sections["full_text"] = text
         
         return sections
-    
-    def _extract_sections_by_patterns(self, text: str, patterns: Dict[str, List[str]]) -> Dict[str, str]:
-        """Extract sections using regex patterns"""
-        return TenKProcessor()._extract_sections_by_patterns(text, patterns)
 
 
 class InsiderTradingProcessor(FilingProcessor):
     """Processor for Forms 3, 4, 5 (insider trading)"""
     
+    # Insider trading form patterns, compiled once per class
+    SECTION_PATTERNS = _compile_patterns({
+        "reporting_person": [
+            r"reporting\s+person",
+            r"name\s+of\s+reporting\s+person",
+            r"insider\s+information"
+        ],
+        "securities_owned": [
+            r"securities\s+owned",
+            r"beneficial\s+ownership",
+            r"shares\s+owned"
+        ],
+        "transactions": [
+            r"securities\s+acquired",
+            r"securities\s+disposed",
+            r"transaction\s+details",
+            r"nature\s+of\s+ownership"
+        ]
+    })
+    
     def __init__(self, form_type: str = "4"):
         super().__init__()
         self.filing_type = form_type
@@ -261,34 +302,10 @@ class InsiderTradingProcessor(FilingProcessor):
         text = self.clean_html(html_content)
         sections = {}
         
-        # Insider trading form patterns
-        section_patterns = {
-            "reporting_person": [
-                r"reporting\s+person",
-                r"name\s+of\s+reporting\s+person",
-                r"insider\s+information"
-            ],
-            "securities_owned": [
-                r"securities\s+owned",
-                r"beneficial\s+ownership",
-                r"shares\s+owned"
-            ],
-            "transactions": [
-                r"securities\s+acquired",
-                r"securities\s+disposed",
-                r"transaction\s+details",
-                r"nature\s+of\s+ownership"
-            ]
-        }
-        
-        sections = self._extract_sections_by_patterns(text, section_patterns)
+        sections = self._extract_sections_by_patterns(text, self.SECTION_PATTERNS)
         sections["full_text"] = text
         
         return sections
-    
-    def _extract_sections_by_patterns(self, text: str, patterns: Dict[str, List[str]]) -> Dict[str, str]:
-        """Extract sections using regex patterns"""
-        return TenKProcessor()._extract_sections_by_patterns(text, patterns)
 
 
 class FinancialContentIdentifier:
@@ -351,33 +368,9 @@ class FinancialContentIdentifier:
                 r"board\s+committees"
             ]
         }
-    
-    def identify_financial_content_type(self, text: str) -> List[str]:
-        """Identify types of financial content in text"""
-        
-        content_types = []
-        text_lower = text.lower()
-        
-        for content_type, patterns in self.financial_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    content_types.append(content_type)
-                    break
-        
-        return content_types
-    
-    def extract_financial_metrics(self, text: str) -> Dict[str, List[str]]:
-        """Extract financial metrics and concepts from text"""
-        
-        metrics = {
-            "revenue_metrics": [],
-            "profitability_metrics": [],
-            "financial_ratios": [],
-            "growth_metrics": []
-        }
         
         # Revenue patterns
-        revenue_patterns = [
+        self.revenue_patterns = [
             r"revenue\s+(?:of\s+)?\$?[\d,]+(?:\.\d+)?\s*(?:million|billion)?",
             r"net\s+sales\s+(?:of\s+)?\$?[\d,]+(?:\.\d+)?\s*(?:million|billion)?",
             r"total\s+revenue\s+(?:increased|decreased)\s+(?:by\s+)?[\d.]+%",
@@ -385,32 +378,79 @@ class FinancialContentIdentifier:
         ]
         
         # Profitability patterns
-        profit_patterns = [
+        self.profit_patterns = [
             r"net\s+income\s+(?:of\s+)?\$?[\d,]+(?:\.\d+)?\s*(?:million|billion)?",
             r"operating\s+income\s+(?:of\s+)?\$?[\d,]+(?:\.\d+)?\s*(?:million|billion)?",
             r"gross\s+profit\s+(?:margin\s+)?(?:of\s+)?[\d.]+%",
             r"operating\s+margin\s+(?:of\s+)?[\d.]+%"
         ]
         
-        # Extract metrics
-        for pattern in revenue_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            metrics["revenue_metrics"].extend(matches)
+        # Compiled once per identifier; the content type patterns match lowercased text
+        self._compiled_financial_patterns = _compile_patterns(self.financial_patterns, flags=0)
+        self._compiled_revenue_patterns = [re.compile(p, re.IGNORECASE) for p in self.revenue_patterns]
+        self._compiled_profit_patterns = [re.compile(p, re.IGNORECASE) for p in self.profit_patterns]
+    
+    def identify_financial_content_type(self, text: str) -> List[str]:
+        """Identify types of financial content in text"""
+        
+        return self.identify_batch([text])[0]
+    
+    def identify_batch(self, texts: List[str]) -> List[List[str]]:
+        """Identify financial content types for every text in a batch"""
+        
+        compiled_patterns = self._compiled_financial_patterns.items()
+        
+        results = []
+        for text in texts:
+            text_lower = text.lower()
+            results.append([
+                content_type for content_type, patterns in compiled_patterns
+                if any(pattern.search(text_lower) for pattern in patterns)
+            ])
+        
+        return results
+    
+    def extract_financial_metrics(self, text: str) -> Dict[str, List[str]]:
+        """Extract financial metrics and concepts from text"""
         
-        for pattern in profit_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            metrics["profitability_metrics"].extend(matches)
+        return self.extract_batch([text])[0]
+    
+    def extract_batch(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+        """Extract financial metrics for every text in a batch"""
+        
+        revenue_patterns = self._compiled_revenue_patterns
+        profit_patterns = self._compiled_profit_patterns
+        
+        results = []
+        for text in texts:
+            metrics = {
+                "revenue_metrics": [],
+                "profitability_metrics": [],
+                "financial_ratios": [],
+                "growth_metrics": []
+            }
+            
+            for pattern in revenue_patterns:
+                metrics["revenue_metrics"].extend(pattern.findall(text))
+            
+            for pattern in profit_patterns:
+                metrics["profitability_metrics"].extend(pattern.findall(text))
+            
+            results.append(metrics)
         
-        return metrics
+        return results
     
-    def calculate_content_quality_score(self, text: str, filing_type: str) -> float:
-        """Calculate quality score for financial content"""
+    def calculate_content_quality_score(self, text: str, filing_type: str,
+                                        content_types: Optional[List[str]] = None,
+                                        metrics: Optional[Dict[str, List[str]]] = None,
+                                        word_count: Optional[int] = None) -> float:
+        """Calculate quality score for financial content, reusing precomputed values if given"""
         
         score = 0.0
-        text_lower = text.lower()
         
         # Base score for length (more generous)
-        word_count = len(text.split())
+        if word_count is None:
+            word_count = len(text.split())
         if word_count > 1000:
             score += 0.4
         elif word_count > 500:
@@ -421,11 +461,13 @@ class FinancialContentIdentifier:
             score += 0.1
         
         # Score for financial content types (more generous)
-        content_types = self.identify_financial_content_type(text)
+        if content_types is None:
+            content_types = self.identify_financial_content_type(text)
         score += len(content_types) * 0.15
         
         # Score for financial metrics
-        metrics = self.extract_financial_metrics(text)
+        if metrics is None:
+            metrics = self.extract_financial_metrics(text)
         total_metrics = sum(len(metric_list) for metric_list in metrics.values())
         score += min(total_metrics * 0.08, 0.4)
         
@@ -460,21 +502,23 @@ class FinancialContentIdentifier:
 class FilingProcessorFactory:
     """Factory for creating filing-specific processors"""
     
+    # Constructors per filing type; Forms 3, 4 and 5 share one processor class
+    PROCESSORS = {
+        "10-K": TenKProcessor,
+        "10-Q": TenQProcessor,
+        "8-K": EightKProcessor,
+        "DEF 14A": ProxyProcessor,
+        "3": partial(InsiderTradingProcessor, "3"),
+        "4": partial(InsiderTradingProcessor, "4"),
+        "5": partial(InsiderTradingProcessor, "5")
+    }
+    
     @staticmethod
+    @lru_cache(maxsize=32)
     def get_processor(filing_type: str) -> FilingProcessor:
-        """Get appropriate processor for filing type"""
-        
-        processors = {
-            "10-K": TenKProcessor,
-            "10-Q": TenQProcessor,
-            "8-K": EightKProcessor,
-            "DEF 14A": ProxyProcessor,
-            "3": lambda: InsiderTradingProcessor("3"),
-            "4": lambda: InsiderTradingProcessor("4"),
-            "5": lambda: InsiderTradingProcessor("5")
-        }
+        """Get appropriate processor for filing type, shared across calls (processors are stateless)"""
         
-        processor_class = processors.get(filing_type, FilingProcessor)
+        processor_class = FilingProcessorFactory.PROCESSORS.get(filing_type, FilingProcessor)
         return processor_class()
     
     @staticmethod
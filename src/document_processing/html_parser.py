@@ -3,10 +3,61 @@ import re
 from typing import Dict, List, Optional
 import os
 
+# BeautifulSoup tree builder: lxml tokenizes in C, html.parser is the pure-Python fallback
+try:
+    import lxml  # noqa: F401
+    _SOUP_FEATURES = 'lxml'
+except ImportError:
+    _SOUP_FEATURES = 'html.parser'
+
+# Leading XML declaration of inline XBRL filings; it carries no text and makes
+# BeautifulSoup warn about parsing XML as HTML
+_XML_DECLARATION_RE = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+# Document header fields, tried in order until one matches
+_COMPANY_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'COMPANY\s+CONFORMED\s+NAME:\s*([^\n]+)',
+    r'REGISTRANT\s+NAME:\s*([^\n]+)',
+    r'FILER:\s*([^\n]+)'
+)]
+
+_DATE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'FILED\s+AS\s+OF\s+DATE:\s*(\d{8})',
+    r'FILING\s+DATE:\s*(\d{4}-\d{2}-\d{2})',
+    r'DATE\s+OF\s+REPORT:\s*(\d{4}-\d{2}-\d{2})'
+)]
+
+_FORM_TYPE_RE = re.compile(r'FORM\s+TYPE:\s*([^\n]+)', re.IGNORECASE)
+
+# Common SEC filing section patterns, each with a lowercase word every match contains
+_SECTION_PATTERNS = [(keyword, re.compile(pattern, re.IGNORECASE), section_type) for keyword, pattern, section_type in (
+    ('part', r'PART\s+I\b', 'Part I'),
+    ('part', r'PART\s+II\b', 'Part II'),
+    ('part', r'PART\s+III\b', 'Part III'),
+    ('part', r'PART\s+IV\b', 'Part IV'),
+    ('item', r'ITEM\s+\d+[A-Z]?\b', 'Item'),
+    ('risk', r'RISK\s+FACTORS', 'Risk Factors'),
+    ('management', r'MANAGEMENT.S\s+DISCUSSION', 'MD&A'),
+    ('business', r'BUSINESS\s+OVERVIEW', 'Business'),
+    ('financial', r'FINANCIAL\s+STATEMENTS', 'Financial Statements'),
+    ('notes', r'NOTES\s+TO\s+FINANCIAL', 'Notes to Financial Statements')
+)]
+
+# Start of the next major section, for extract_section_text
+_NEXT_SECTION_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\n\s*ITEM\s+\d+',
+    r'\n\s*PART\s+[IVX]+',
+    r'\n\s*[A-Z\s]{10,}\n'
+)]
+
+_TABLE_TAG_RE = re.compile(r'<table', re.IGNORECASE)
+
 
 class HTMLParser:
     def __init__(self):
         self.soup = None
+        self._html = None
+        self._raw_text = None
         
     def parse_file(self, filepath: str) -> Dict:
         """Parse SEC HTML filing and extract structured content."""
@@ -24,7 +75,13 @@ class HTMLParser:
     def parse_content(self, html_content: str, source_path: str = "") -> Dict:
         """Parse HTML content and extract structured information."""
         
-        self.soup = BeautifulSoup(html_content, 'html.parser')
+        self._html = _XML_DECLARATION_RE.sub('', html_content, count=1)
+        self.soup = BeautifulSoup(self._html, _SOUP_FEATURES)
+        
+        # Remove script and style elements, then walk the tree for text only once
+        for script in self.soup(["script", "style"]):
+            script.decompose()
+        self._raw_text = self.soup.get_text()
         
         # Extract basic document info
         doc_info = self._extract_document_info()
@@ -59,34 +116,22 @@ class HTMLParser:
             info['title'] = title_tag.get_text().strip()
         
         # Look for company name in various places
-        company_patterns = [
-            r'COMPANY\s+CONFORMED\s+NAME:\s*([^\n]+)',
-            r'REGISTRANT\s+NAME:\s*([^\n]+)',
-            r'FILER:\s*([^\n]+)'
-        ]
-        
-        text = self.soup.get_text()
-        for pattern in company_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        text = self._raw_text
+        for pattern in _COMPANY_PATTERNS:
+            match = pattern.search(text)
             if match:
                 info['company_name'] = match.group(1).strip()
                 break
         
         # Extract filing date
-        date_patterns = [
-            r'FILED\s+AS\s+OF\s+DATE:\s*(\d{8})',
-            r'FILING\s+DATE:\s*(\d{4}-\d{2}-\d{2})',
-            r'DATE\s+OF\s+REPORT:\s*(\d{4}-\d{2}-\d{2})'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 info['filing_date'] = match.group(1).strip()
                 break
         
         # Extract form type
-        form_match = re.search(r'FORM\s+TYPE:\s*([^\n]+)', text, re.IGNORECASE)
+        form_match = _FORM_TYPE_RE.search(text)
         if form_match:
             info['form_type'] = form_match.group(1).strip()
         
@@ -96,26 +141,15 @@ class HTMLParser:
         """Extract major document sections."""
         
         sections = []
+        text = self._raw_text
+        text_lower = text.lower()
         
-        # Common SEC filing section patterns
-        section_patterns = [
-            (r'PART\s+I\b', 'Part I'),
-            (r'PART\s+II\b', 'Part II'),
-            (r'PART\s+III\b', 'Part III'),
-            (r'PART\s+IV\b', 'Part IV'),
-            (r'ITEM\s+\d+[A-Z]?\b', 'Item'),
-            (r'RISK\s+FACTORS', 'Risk Factors'),
-            (r'MANAGEMENT.S\s+DISCUSSION', 'MD&A'),
-            (r'BUSINESS\s+OVERVIEW', 'Business'),
-            (r'FINANCIAL\s+STATEMENTS', 'Financial Statements'),
-            (r'NOTES\s+TO\s+FINANCIAL', 'Notes to Financial Statements')
-        ]
-        
-        text = self.soup.get_text()
-        
-        for pattern, section_type in section_patterns:
-            matches = list(re.finditer(pattern, text, re.IGNORECASE))
-            for match in matches:
+        for keyword, pattern, section_type in _SECTION_PATTERNS:
+            # A substring test is far cheaper than a case-insensitive scan that finds nothing
+            if keyword not in text_lower:
+                continue
+            
+            for match in pattern.finditer(text):
                 start_pos = match.start()
                 section_title = text[start_pos:start_pos+100].split('\n')[0].strip()
                 
@@ -123,7 +157,7 @@ class HTMLParser:
                     'type': section_type,
                     'title': section_title,
                     'start_position': start_pos,
-                    'pattern_matched': pattern
+                    'pattern_matched': pattern.pattern
                 })
         
         # Sort sections by position
@@ -135,6 +169,11 @@ class HTMLParser:
         """Extract and parse HTML tables."""
         
         tables = []
+        
+        # Cover pages and many exhibits have no tables; skip the tree search for them
+        if not _TABLE_TAG_RE.search(self._html):
+            return tables
+        
         table_tags = self.soup.find_all('table')
         
         for i, table in enumerate(table_tags):
@@ -164,22 +203,11 @@ class HTMLParser:
     def _extract_clean_text(self) -> str:
         """Extract and clean all text content."""
         
-        # Remove script and style elements
-        for script in self.soup(["script", "style"]):
-            script.decompose()
-        
-        # Get text and clean it
-        text = self.soup.get_text()
-        
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
+        # Text of the parsed document, script and style already removed
+        text = self._raw_text
         
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        # Collapse every whitespace run to one space; str.split() does it in one C pass
+        return ' '.join(text.split())
     
     def extract_section_text(self, section_title: str) -> Optional[str]:
         """Extract text from a specific section."""
@@ -187,7 +215,7 @@ class HTMLParser:
         if not self.soup:
             return None
         
-        text = self.soup.get_text()
+        text = self._raw_text
         
         # Find section start
         section_match = re.search(
@@ -202,17 +230,11 @@ class HTMLParser:
         start_pos = section_match.end()
         
         # Find next major section (rough heuristic)
-        next_section_patterns = [
-            r'\n\s*ITEM\s+\d+',
-            r'\n\s*PART\s+[IVX]+',
-            r'\n\s*[A-Z\s]{10,}\n'
-        ]
-        
         end_pos = len(text)
-        for pattern in next_section_patterns:
-            match = re.search(pattern, text[start_pos:], re.IGNORECASE)
+        for pattern in _NEXT_SECTION_PATTERNS:
+            match = pattern.search(text, start_pos)
             if match:
-                end_pos = start_pos + match.start()
+                end_pos = match.start()
                 break
         
         section_text = text[start_pos:end_pos].strip()
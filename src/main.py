@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import logging
 import os
 import sys
 from typing import Dict, List
@@ -11,7 +12,7 @@ from document_processing.document_chunker import DocumentChunker
 from vector_store.vector_db import VectorDB
 from query_processing.query_router import QueryRouter
 from answer_generation.answer_synthesizer import AnswerSynthesizer
-from config.settings import RAW_DATA_DIR
+from config.settings import RAW_DATA_DIR, LOG_LEVEL
 
 
 class SECFilingsQA:
@@ -50,7 +51,8 @@ class SECFilingsQA:
     def _process_documents(self):
         html_files = []
         if os.path.exists(RAW_DATA_DIR):
-            for filename in os.listdir(RAW_DATA_DIR):
+            # TICKER_FILINGTYPE_DATE names sort related filings next to each other
+            for filename in sorted(os.listdir(RAW_DATA_DIR)):
                 if filename.endswith('.html'):
                     html_files.append(os.path.join(RAW_DATA_DIR, filename))
         
@@ -131,6 +133,10 @@ class SECFilingsQA:
 
 
 def main():
+    # Configured here rather than under __main__ so run_main.py gets it too;
+    # basicConfig leaves any handlers the caller already set up alone
+    logging.basicConfig(level=LOG_LEVEL, format="%(message)s")
+    
     print("SEC Filings QA Agent")
     print("===================")
     
@@ -1,9 +1,131 @@
 import re
-from typing import List, Dict, Optional, Set
+import threading
+from functools import lru_cache
+from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime
 
 from config.settings import COMPANIES
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+def _word_pattern(term: str) -> re.Pattern:
+    return re.compile(r'\b' + re.escape(term) + r'\b')
+
+
+class _PatternSet:
+    """Regexes matched in one Hyperscan pass when available, else one re.search each."""
+    
+    def __init__(self, patterns: List[re.Pattern]):
+        self.patterns = patterns
+        self.database = None
+        # A Scratch serves one scan at a time, so every thread gets its own
+        self._local = threading.local()
+        if hyperscan is not None:
+            try:
+                database = hyperscan.Database()
+                database.compile(
+                    expressions=[pattern.pattern.encode() for pattern in patterns],
+                    ids=list(range(len(patterns))),
+                    elements=len(patterns),
+                    flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns)
+                )
+                self.database = database
+            except hyperscan.error as e:
+                print(f"Hyperscan unavailable for entity patterns, using re: {e}")
+    
+    def matches(self, text: str) -> List[int]:
+        """Indexes of the patterns found in text, in pattern order."""
+        # Hyperscan's \b only knows ASCII word characters, unlike re on str
+        if self.database is None or not text.isascii():
+            return [index for index, pattern in enumerate(self.patterns) if pattern.search(text)]
+        
+        found = set()
+        
+        def on_match(pattern_id, start, end, flags, context):
+            found.add(pattern_id)
+        
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self.database)
+        
+        self.database.scan(text.encode(), match_event_handler=on_match, scratch=scratch)
+        return sorted(found)
+
+
+# Words that contain a short ticker and so must not count as a mention of it
+_FALSE_POSITIVE_CONTEXTS = {
+    ticker: (_word_pattern(ticker), [(context, _word_pattern(context)) for context in contexts])
+    for ticker, contexts in {
+        'ge': ['general', 'generate', 'generation', 'genetic', 'geography', 'geometry'],
+        'ba': ['bachelor', 'basic', 'basketball', 'battle'],
+        'cat': ['category', 'catalog', 'catch', 'cattle'],
+        'cvx': []
+    }.items()
+}
+
+_YEAR_RE = re.compile(r'\b(20[2-4][0-9])\b')
+
+_QUARTER_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\bQ[1-4]\b',
+    r'\b[1-4]Q\b',
+    r'\bfirst quarter\b',
+    r'\bsecond quarter\b',
+    r'\bthird quarter\b',
+    r'\bfourth quarter\b'
+)]
+
+_FILING_PATTERNS = [(re.compile(pattern), filing_type) for pattern, filing_type in (
+    (r'\b10-k\b', '10-K'),
+    (r'\bannual report\b', '10-K'),
+    (r'\b10-q\b', '10-Q'),
+    (r'\bquarterly report\b', '10-Q'),
+    (r'\b8-k\b', '8-K'),
+    (r'\bcurrent report\b', '8-K'),
+    (r'\bproxy\b', 'DEF 14A'),
+    (r'\bdef 14a\b', 'DEF 14A'),
+    (r'\binsider trading\b', ['3', '4', '5']),
+    (r'\bform [345]\b', ['3', '4', '5'])
+)]
+_FILING_MATCHER = _PatternSet([pattern for pattern, _ in _FILING_PATTERNS])
+
+# Plain substring keywords, each group matched as one literal alternation
+_FINANCIAL_TERMS = {
+    "revenue": ["revenue", "sales", "income", "earnings"],
+    "expenses": ["expenses", "costs", "spending"],
+    "profit": ["profit", "net income", "earnings"],
+    "cash_flow": ["cash flow", "operating cash", "free cash flow"],
+    "debt": ["debt", "liabilities", "borrowing"],
+    "assets": ["assets", "balance sheet"],
+    "risk_factors": ["risk", "risks", "risk factors"],
+    "competition": ["competition", "competitive", "competitors"],
+    "r&d": ["r&d", "research", "development", "innovation"],
+    "acquisitions": ["acquisition", "merger", "m&a"],
+    "executive_compensation": ["compensation", "executive pay", "salary"],
+    "working_capital": ["working capital", "current assets"],
+    "climate": ["climate", "environmental", "sustainability"],
+    "ai_automation": ["ai", "artificial intelligence", "automation", "technology"]
+}
+_FINANCIAL_CONCEPTS = list(_FINANCIAL_TERMS)
+_CONCEPT_MATCHER = _PatternSet([
+    re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+    for keywords in _FINANCIAL_TERMS.values()
+])
+
+_RELATIVE_TERMS = [
+    "recent", "latest", "current", "last year", "this year",
+    "over time", "historical", "trend", "evolution"
+]
+_RELATIVE_MATCHER = _PatternSet([re.compile(re.escape(term)) for term in _RELATIVE_TERMS])
+
+_COMPARISON_MATCHER = _PatternSet([re.compile('|'.join(re.escape(keyword) for keyword in (
+    "compare", "comparison", "versus", "vs", "against",
+    "difference", "similar", "contrast", "between"
+)))])
+
 
 class EntityExtractor:
     def __init__(self):
@@ -32,54 +154,56 @@ class EntityExtractor:
             "caterpillar": "CAT",
             "boeing": "BA"
         }
+        
+        # Word-boundary patterns for tickers and name variants, compiled once
+        self._ticker_patterns = [
+            (ticker, _word_pattern(ticker.lower())) for ticker in COMPANIES.keys()
+        ]
+        self._variation_patterns = [
+            (_word_pattern(name_variant), ticker)
+            for name_variant, ticker in self.company_variations.items()
+        ]
+        self._ticker_matcher = _PatternSet([pattern for _, pattern in self._ticker_patterns])
+        self._variation_matcher = _PatternSet([pattern for pattern, _ in self._variation_patterns])
+        
+        # Interactive sessions repeat queries, so remember recent answers
+        self._extract_tickers_cached = lru_cache(maxsize=2048)(self._extract_tickers_impl)
     
     def extract_tickers(self, query: str) -> List[str]:
+        return list(self._extract_tickers_cached(query.lower()))
+    
+    def _extract_tickers_impl(self, query_lower: str) -> Tuple[str, ...]:
         
         tickers = set()
-        query_lower = query.lower()
         
-        
-        for ticker in COMPANIES.keys():
-            pattern = r'\b' + re.escape(ticker.lower()) + r'\b'
-            if re.search(pattern, query_lower):
-                if len(ticker) <= 2:
-                    if self._validate_short_ticker_context(query_lower, ticker.lower()):
-                        tickers.add(ticker)
-                else:
+        for index in self._ticker_matcher.matches(query_lower):
+            ticker = self._ticker_patterns[index][0]
+            if len(ticker) <= 2:
+                if self._validate_short_ticker_context(query_lower, ticker.lower()):
                     tickers.add(ticker)
-        
-        for name_variant, ticker in self.company_variations.items():
-            pattern = r'\b' + re.escape(name_variant) + r'\b'
-            if re.search(pattern, query_lower):
+            else:
                 tickers.add(ticker)
         
+        for index in self._variation_matcher.matches(query_lower):
+            tickers.add(self._variation_patterns[index][1])
+        
         
         for full_name, ticker in self.name_to_ticker.items():
             if full_name in query_lower:
                 tickers.add(ticker)
         
-        return list(tickers)
+        return tuple(tickers)
     
     def _validate_short_ticker_context(self, query_lower: str, ticker: str) -> bool:
         
-        false_positive_contexts = {
-            'ge': ['general', 'generate', 'generation', 'genetic', 'geography', 'geometry'],
-            'ba': ['bachelor', 'basic', 'basketball', 'battle'],
-            'cat': ['category', 'catalog', 'catch', 'cattle'],
-            'cvx': [],
-            'ge': ['general', 'generate', 'generation', 'genetic', 'geography', 'geometry']
-        }
-        
-        if ticker not in false_positive_contexts:
+        if ticker not in _FALSE_POSITIVE_CONTEXTS:
             return True
         
-        for false_context in false_positive_contexts[ticker]:
+        ticker_pattern, false_contexts = _FALSE_POSITIVE_CONTEXTS[ticker]
+        for false_context, false_pattern in false_contexts:
             if false_context in query_lower:
-                ticker_pattern = r'\b' + re.escape(ticker) + r'\b'
-                false_pattern = r'\b' + re.escape(false_context) + r'\b'
-                
-                ticker_matches = list(re.finditer(ticker_pattern, query_lower))
-                false_matches = list(re.finditer(false_pattern, query_lower))
+                ticker_matches = list(ticker_pattern.finditer(query_lower))
+                false_matches = list(false_pattern.finditer(query_lower))
                 
                 for ticker_match in ticker_matches:
                     for false_match in false_matches:
@@ -91,6 +215,12 @@ class EntityExtractor:
         return True
     
     def extract_time_periods(self, query: str) -> Dict:
+        time_info = self._extract_time_periods_cached(query)
+        return {key: list(values) for key, values in time_info.items()}
+    
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _extract_time_periods_cached(query: str) -> Dict:
         
         time_info = {
             "years": [],
@@ -99,90 +229,49 @@ class EntityExtractor:
             "relative_terms": []
         }
         
-        year_pattern = r'\b(20[2-4][0-9])\b'
-        years = re.findall(year_pattern, query)
+        years = _YEAR_RE.findall(query)
         time_info["years"] = list(set(years))
         
-        quarter_patterns = [
-            r'\bQ[1-4]\b',
-            r'\b[1-4]Q\b',
-            r'\bfirst quarter\b',
-            r'\bsecond quarter\b',
-            r'\bthird quarter\b',
-            r'\bfourth quarter\b'
-        ]
-        
-        for pattern in quarter_patterns:
-            matches = re.findall(pattern, query, re.IGNORECASE)
+        for pattern in _QUARTER_PATTERNS:
+            matches = pattern.findall(query)
             time_info["quarters"].extend(matches)
         
-        relative_terms = [
-            "recent", "latest", "current", "last year", "this year",
-            "over time", "historical", "trend", "evolution"
-        ]
-        
-        for term in relative_terms:
-            if term in query.lower():
-                time_info["relative_terms"].append(term)
+        for index in _RELATIVE_MATCHER.matches(query.lower()):
+            time_info["relative_terms"].append(_RELATIVE_TERMS[index])
         
         return time_info
     
     def extract_filing_types(self, query: str) -> List[str]:
+        return list(self._extract_filing_types_cached(query.lower()))
+    
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _extract_filing_types_cached(query_lower: str) -> Tuple[str, ...]:
         
         filing_types = []
-        query_lower = query.lower()
-        
-        filing_patterns = {
-            r'\b10-k\b': '10-K',
-            r'\bannual report\b': '10-K',
-            r'\b10-q\b': '10-Q',
-            r'\bquarterly report\b': '10-Q',
-            r'\b8-k\b': '8-K',
-            r'\bcurrent report\b': '8-K',
-            r'\bproxy\b': 'DEF 14A',
-            r'\bdef 14a\b': 'DEF 14A',
-            r'\binsider trading\b': ['3', '4', '5'],
-            r'\bform [345]\b': ['3', '4', '5']
-        }
         
-        for pattern, filing_type in filing_patterns.items():
-            if re.search(pattern, query_lower):
-                if isinstance(filing_type, list):
-                    filing_types.extend(filing_type)
-                else:
-                    filing_types.append(filing_type)
+        for index in _FILING_MATCHER.matches(query_lower):
+            filing_type = _FILING_PATTERNS[index][1]
+            if isinstance(filing_type, list):
+                filing_types.extend(filing_type)
+            else:
+                filing_types.append(filing_type)
         
-        return list(set(filing_types))
+        return tuple(set(filing_types))
     
     def extract_financial_concepts(self, query: str) -> List[str]:
         
         concepts = []
-        query_lower = query.lower()
         
-        financial_terms = {
-            "revenue": ["revenue", "sales", "income", "earnings"],
-            "expenses": ["expenses", "costs", "spending"],
-            "profit": ["profit", "net income", "earnings"],
-            "cash_flow": ["cash flow", "operating cash", "free cash flow"],
-            "debt": ["debt", "liabilities", "borrowing"],
-            "assets": ["assets", "balance sheet"],
-            "risk_factors": ["risk", "risks", "risk factors"],
-            "competition": ["competition", "competitive", "competitors"],
-            "r&d": ["r&d", "research", "development", "innovation"],
-            "acquisitions": ["acquisition", "merger", "m&a"],
-            "executive_compensation": ["compensation", "executive pay", "salary"],
-            "working_capital": ["working capital", "current assets"],
-            "climate": ["climate", "environmental", "sustainability"],
-            "ai_automation": ["ai", "artificial intelligence", "automation", "technology"]
-        }
-        
-        for concept, keywords in financial_terms.items():
-            if any(keyword in query_lower for keyword in keywords):
-                concepts.append(concept)
+        for index in _CONCEPT_MATCHER.matches(query.lower()):
+            concepts.append(_FINANCIAL_CONCEPTS[index])
         
         return concepts
     
     def extract_comparison_intent(self, query: str) -> Dict:
+        return self._comparison_intent_from(query, self.extract_tickers(query))
+    
+    def _comparison_intent_from(self, query: str, tickers: List[str]) -> Dict:
         
         comparison_info = {
             "is_comparison": False,
@@ -190,34 +279,31 @@ class EntityExtractor:
             "entities": []
         }
         
-        comparison_keywords = [
-            "compare", "comparison", "versus", "vs", "against",
-            "difference", "similar", "contrast", "between"
-        ]
-        
         query_lower = query.lower()
         
-        if any(keyword in query_lower for keyword in comparison_keywords):
+        if _COMPARISON_MATCHER.matches(query_lower):
             comparison_info["is_comparison"] = True
             
             if "trend" in query_lower or "over time" in query_lower:
                 comparison_info["comparison_type"] = "temporal"
-            elif len(self.extract_tickers(query)) > 1:
+            elif len(tickers) > 1:
                 comparison_info["comparison_type"] = "cross_company"
             else:
                 comparison_info["comparison_type"] = "general"
             
-            comparison_info["entities"] = self.extract_tickers(query)
+            comparison_info["entities"] = list(tickers)
         
         return comparison_info
     
     def extract_all_entities(self, query: str) -> Dict:
         
+        tickers = self.extract_tickers(query)
+        
         return {
-            "tickers": self.extract_tickers(query),
+            "tickers": tickers,
             "time_periods": self.extract_time_periods(query),
             "filing_types": self.extract_filing_types(query),
             "financial_concepts": self.extract_financial_concepts(query),
-            "comparison_intent": self.extract_comparison_intent(query),
+            "comparison_intent": self._comparison_intent_from(query, tickers),
             "original_query": query
         }
\ No newline at end of file